@@ -0,0 +1,83 @@
+"""
+Compare the per-order object path (OrderBook -> ClientOrder -> DirectedAcyclicGraph) with the
+columnar BatchOrderBook when pricing a whole book and computing its copper/zinc sensitivities.
+
+Run from the repository root with: `python benchmarks/batch_pricing_benchmark.py`
+"""
+# External dependencies
+import argparse
+import time
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.BatchOrderBook import BatchOrderBook
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+
+
+def build_inputs(n_orders: int, seed: int = 0):
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), [7.5, 4.9, 3.5, 3.05]):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+
+    rng = np.random.default_rng(seed)
+    qualities = QUALITY.get_all_qualities()
+    weights = rng.uniform(1.0, 30000.0, n_orders).tolist()
+    lengths = rng.uniform(1.0, 200.0, n_orders).tolist()
+    quality_idx = rng.integers(len(qualities), size=n_orders).tolist()
+    orders = {
+        k: ["Client " + str(k), weights[k], lengths[k], qualities[quality_idx[k]]]
+        for k in range(n_orders)
+    }
+    return static_data, market_data, orders
+
+
+def price_object_path(static_data, market_data, orders):
+    book = OrderBook(static_data)
+    book.add_orders(orders, market_data)
+    book.get_order_prices()
+    for order in book._client_orders.values():
+        order.get_sensitivity(METALS.COPPER)
+        order.get_sensitivity(METALS.ZINC)
+
+
+def price_batch_path(static_data, market_data, orders):
+    book = BatchOrderBook(static_data)
+    book.add_orders(orders, market_data)
+    book.get_order_prices()
+    book.get_sensitivities(METALS.COPPER)
+    book.get_sensitivities(METALS.ZINC)
+
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'orders':>10} {'object (s)':>12} {'batch (s)':>12} {'speedup':>10}")
+    for n_orders in args.sizes:
+        inputs = build_inputs(n_orders)
+        object_time = time_call(price_object_path, *inputs)
+        batch_time = time_call(price_batch_path, *inputs)
+        print(
+            f"{n_orders:>10} {object_time:>12.4f} {batch_time:>12.4f} {object_time / batch_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compare labour factor lookups for a book of rod lengths: one StaticData.get_labour_factor call per
+length against a single vectorised StaticData.get_labour_factors call.
+
+Run from the repository root with: `python benchmarks/labour_factor_benchmark.py`
+"""
+# External dependencies
+import argparse
+import time
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.static.StaticData import StaticData
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, default=1_000_000)
+    parser.add_argument("--bands", type=int, default=4)
+    args = parser.parse_args()
+
+    static_data = StaticData()
+    breakpoints = np.linspace(0.0, 200.0, args.bands, endpoint=False)
+    static_data.set_labour_factors(
+        list(zip(breakpoints.tolist(), np.linspace(1.0, 1.5, args.bands).tolist()))
+    )
+    rod_lengths = np.random.default_rng(0).uniform(0.0, 250.0, args.lengths)
+
+    start = time.perf_counter()
+    scalar = [static_data.get_labour_factor(x) for x in rod_lengths.tolist()]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorised = static_data.get_labour_factors(rod_lengths)
+    vectorised_time = time.perf_counter() - start
+
+    assert np.array_equal(vectorised, scalar)
+    print(
+        f"{'lengths':>10} {'bands':>6} {'scalar (s)':>11} {'vector (s)':>11} {'speedup':>9}"
+    )
+    print(
+        f"{args.lengths:>10} {args.bands:>6} {scalar_time:>11.4f} {vectorised_time:>11.4f} {scalar_time / vectorised_time:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Memory held by an OrderBook whose orders keep their pricing graphs, and by one whose orders are collapsed to
+compact (price, copper sensitivity, zinc sensitivity) records, measured with tracemalloc.
+
+Run from the repository root with: `python benchmarks/order_memory_benchmark.py`
+"""
+# External dependencies
+import argparse
+import gc
+import time
+import tracemalloc
+
+# Internal dependencies
+from aad_pricing.pricing.OrderBook import OrderBook
+from batch_pricing_benchmark import build_inputs
+
+
+def measure_book(static_data, market_data, orders, compact_orders: bool) -> tuple:
+    # Memory still allocated once the book is priced, peak memory while pricing and elapsed time
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    book = OrderBook(static_data, compact_orders=compact_orders)
+    book.add_orders(orders, market_data)
+    book.get_total_price()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del book
+    return current, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'orders':>8} {'storage':>8} {'held MB':>9} {'peak MB':>9} {'bytes/order':>12} {'time s':>8}"
+    )
+    for n_orders in args.orders:
+        static_data, market_data, orders = build_inputs(n_orders)
+        for storage, compact_orders in [("graph", False), ("compact", True)]:
+            current, peak, elapsed = measure_book(
+                static_data, market_data, orders, compact_orders
+            )
+            print(
+                f"{n_orders:>8} {storage:>8} {current / 2**20:>9.1f} {peak / 2**20:>9.1f} "
+                f"{current / n_orders:>12,.0f} {elapsed:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure how BatchOrderBook pricing scales with the number of ShardedExecutor workers, for the compiled
+replay kernel (NumPy, thread pool) and the per-order graph kernel (pure Python, process pool), against
+the serial path. Prices are checked to match the serial path exactly.
+
+Run from the repository root with: `python benchmarks/parallel_pricing_benchmark.py`
+"""
+# External dependencies
+import argparse
+import os
+import time
+
+# Internal dependencies
+from aad_pricing.pricing.BatchOrderBook import (
+    BatchOrderBook,
+    graph_kernel,
+    replay_kernel,
+)
+from aad_pricing.pricing.ShardedExecutor import ShardedExecutor
+from batch_pricing_benchmark import build_inputs
+
+
+def price_book(static_data, market_data, orders, kernel, executor=None) -> tuple:
+    book = BatchOrderBook(static_data, executor=executor, kernel=kernel)
+    book.add_orders(orders, market_data)
+    start = time.perf_counter()
+    prices = book.get_order_prices()
+    return time.perf_counter() - start, prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--graph-orders", type=int, default=20_000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+    print(f"cpu count: {os.cpu_count()}")
+
+    benchmarks = [
+        ("replay", replay_kernel, "thread", args.orders),
+        ("graph", graph_kernel, "process", args.graph_orders),
+    ]
+    print(
+        f"{'kernel':>8} {'orders':>10} {'workers':>8} {'time (s)':>10} {'speedup':>8}"
+    )
+    for label, kernel, backend, n_orders in benchmarks:
+        inputs = build_inputs(n_orders)
+        serial_time, serial_prices = price_book(*inputs, kernel)
+        print(
+            f"{label:>8} {n_orders:>10} {'serial':>8} {serial_time:>10.4f} {1.0:>7.2f}x"
+        )
+        for workers in sorted(set(args.workers)):
+            chunk_size = -(-n_orders // workers)
+            with ShardedExecutor(workers, chunk_size, backend) as executor:
+                sharded_time, prices = price_book(*inputs, kernel, executor)
+            assert prices == serial_prices, "Sharded prices differ from the serial path"
+            print(
+                f"{label:>8} {n_orders:>10} {workers:>8} {sharded_time:>10.4f} {serial_time / sharded_time:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
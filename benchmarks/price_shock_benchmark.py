@@ -0,0 +1,90 @@
+"""
+Time the price shock surface for a 100k order book at 250x250 and 1000x1000 grids, against the previous
+implementation that broadcast every order over the list of all shock pairs.
+
+Run from the repository root with: `python benchmarks/price_shock_benchmark.py`
+"""
+# External dependencies
+import argparse
+import itertools
+import time
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.BatchOrderBook import BatchOrderBook
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.Constants import METALS
+from batch_pricing_benchmark import build_inputs
+
+
+def legacy_price_shock_effects(
+    book: OrderBook, zinc_shock_percentages, copper_shock_percentages, n_steps
+):
+    # Pre-vectorisation implementation, kept for comparison
+    zinc_shock_ladder = np.linspace(
+        zinc_shock_percentages[0] / 100.0, zinc_shock_percentages[1] / 100.0, n_steps
+    ).tolist()
+    copper_shock_ladder = np.linspace(
+        copper_shock_percentages[0] / 100.0,
+        copper_shock_percentages[1] / 100.0,
+        n_steps,
+    ).tolist()
+    shock_pairs = list(itertools.product(zinc_shock_ladder, copper_shock_ladder))
+    price_change = np.zeros_like(shock_pairs)
+    for order in book._client_orders.values():
+        sensitivities = (
+            order.get_sensitivity(METALS.ZINC),
+            order.get_sensitivity(METALS.COPPER),
+        )
+        price_change += np.multiply(
+            np.full_like(shock_pairs, sensitivities), shock_pairs
+        )
+    diff_zn_price = [pair[0] * 100.0 for pair in shock_pairs]
+    diff_cu_price = [pair[1] * 100.0 for pair in shock_pairs]
+    return diff_zn_price, diff_cu_price, np.add.reduce(price_change, 1)
+
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--grids", type=int, nargs="+", default=[250, 1000])
+    parser.add_argument(
+        "--legacy-orders",
+        type=int,
+        default=100,
+        help="Book size for the previous implementation, which scales with orders x grid points",
+    )
+    args = parser.parse_args()
+
+    static_data, market_data, orders = build_inputs(args.orders)
+    book, batch_book = OrderBook(static_data), BatchOrderBook(static_data)
+    book.add_orders(orders, market_data)
+    batch_book.add_orders(orders, market_data)
+    legacy_book = OrderBook(static_data)
+    legacy_book.add_orders(
+        {k: orders[k] for k in range(args.legacy_orders)}, market_data
+    )
+
+    print(
+        f"{'grid':>10} {'legacy/order (s)':>18} {'OrderBook (s)':>15} {'Batch (s)':>11}"
+    )
+    for n_steps in args.grids:
+        shocks = ([-10, 10], [-10, 10], n_steps)
+        legacy_time = time_call(legacy_price_shock_effects, legacy_book, *shocks)
+        book_time = time_call(book.get_price_shock_effects, *shocks)
+        batch_time = time_call(batch_book.get_price_shock_effects, *shocks)
+        print(
+            f"{str(n_steps) + 'x' + str(n_steps):>10} {legacy_time / args.legacy_orders:>18.5f}"
+            f" {book_time:>15.4f} {batch_time:>11.4f}"
+        )
+    print(f"OrderBook and Batch timings for {args.orders} orders")
+
+
+if __name__ == "__main__":
+    main()
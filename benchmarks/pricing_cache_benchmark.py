@@ -0,0 +1,68 @@
+"""
+Price books whose orders share (weight, rod length, zinc quality) combinations with and without a
+PricingCache, and rebuild the book a second time as a repeated Dash callback would.
+
+Run from the repository root with: `python benchmarks/pricing_cache_benchmark.py`
+"""
+# External dependencies
+import argparse
+import time
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.pricing.PricingCache import PricingCache
+from aad_pricing.static.Constants import QUALITY
+from batch_pricing_benchmark import build_inputs
+
+
+def build_repeated_orders(n_orders: int, n_distinct: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    qualities = QUALITY.get_all_qualities()
+    combinations = list(
+        zip(
+            rng.integers(1, 300, n_distinct).tolist(),
+            rng.integers(1, 200, n_distinct).tolist(),
+            rng.choice(qualities, n_distinct).tolist(),
+        )
+    )
+    picks = rng.integers(n_distinct, size=n_orders).tolist()
+    return {
+        k: ["Client " + str(k), *combinations[pick]] for k, pick in enumerate(picks)
+    }
+
+
+def price_book(static_data, market_data, orders, pricing_cache=None) -> float:
+    start = time.perf_counter()
+    book = OrderBook(static_data, pricing_cache)
+    book.add_orders(orders, market_data)
+    book.get_total_price()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--capacity", type=int, default=100_000)
+    args = parser.parse_args()
+
+    static_data, market_data, _ = build_inputs(0)
+    print(
+        f"{'orders':>8} {'distinct':>9} {'no cache (s)':>13} {'cold (s)':>9} {'warm (s)':>9} {'hit rate':>9} {'evictions':>10}"
+    )
+    for n_distinct in args.distinct:
+        orders = build_repeated_orders(args.orders, n_distinct)
+        uncached_time = price_book(static_data, market_data, orders)
+        cache = PricingCache(args.capacity)
+        cold_time = price_book(static_data, market_data, orders, cache)
+        warm_time = price_book(static_data, market_data, orders, cache)
+        statistics = cache.get_statistics()
+        print(
+            f"{args.orders:>8} {n_distinct:>9} {uncached_time:>13.4f} {cold_time:>9.4f} {warm_time:>9.4f} "
+            f"{statistics['hit_rate']:>9.3f} {statistics['evictions']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
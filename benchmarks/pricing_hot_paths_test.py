@@ -0,0 +1,160 @@
+"""
+pytest-benchmark suite of the pricing hot paths: graph construction, gradient sweep, order book pricing,
+book-level market sensitivities, price shock grids, labour factor lookups and core module imports, at several
+book sizes and grid resolutions.
+
+Run from the repository root with:
+`pytest benchmarks --benchmark-storage=file://test-reports/benchmarks --benchmark-autosave`
+which saves the results as JSON. Adding `--benchmark-compare=0001 --benchmark-compare-fail=median:25%` fails
+the run when a benchmark is more than 25% slower than in saved run 0001, see docker-compose.yml.
+"""
+# External dependencies
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.BatchOrderBook import BatchOrderBook
+from aad_pricing.pricing.DirectedAcyclicGraph import DirectedAcyclicGraph
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.pricing.PricingCache import price_graph
+from aad_pricing.static.Constants import METALS
+from batch_pricing_benchmark import build_inputs
+
+BOOK_SIZES = [100, 1_000, 10_000]
+GRID_STEPS = [10, 100, 1_000]
+# Total weight, copper fraction, copper price, zinc price, labour factor
+GRAPH_INPUTS = (2340.0, 0.66, 8.22, 7.5, 1.15)
+# Modules that must import quickly without the web interface or file formats
+CORE_MODULES = [
+    "aad_pricing.static.StaticData",
+    "aad_pricing.external_input.MarketData",
+    "aad_pricing.external_input.ClientOrder",
+    "aad_pricing.external_input.OrderFile",
+    "aad_pricing.pricing.OrderBook",
+    "aad_pricing.pricing.BatchOrderBook",
+    "aad_pricing.cli",
+]
+
+
+@pytest.fixture(scope="module", params=BOOK_SIZES)
+def book_inputs(request):
+    return build_inputs(request.param)
+
+
+@pytest.fixture(scope="module")
+def priced_book():
+    static_data, market_data, orders = build_inputs(1_000)
+    book = OrderBook(static_data)
+    book.add_orders(orders, market_data)
+    book.get_total_price()
+    return book
+
+
+@pytest.mark.benchmark(group="graph")
+def test_graph_construction(benchmark):
+    benchmark(DirectedAcyclicGraph, *GRAPH_INPUTS)
+
+
+@pytest.mark.benchmark(group="graph")
+def test_gradient_sweep(benchmark):
+    # Adjoints are cached on the nodes, every round sweeps a new graph
+    benchmark.pedantic(
+        price_graph,
+        setup=lambda: ((DirectedAcyclicGraph(*GRAPH_INPUTS),), {}),
+        rounds=2_000,
+    )
+
+
+@pytest.mark.benchmark(group="add_orders")
+def test_add_orders(benchmark, book_inputs):
+    static_data, market_data, orders = book_inputs
+    benchmark.pedantic(
+        lambda book: book.add_orders(orders, market_data),
+        setup=lambda: ((OrderBook(static_data),), {}),
+        rounds=3,
+    )
+
+
+@pytest.mark.benchmark(group="get_order_prices")
+def test_get_order_prices(benchmark, book_inputs):
+    # Prices and sensitivities of a newly added book
+    static_data, market_data, orders = book_inputs
+
+    def add_orders():
+        book = OrderBook(static_data)
+        book.add_orders(orders, market_data)
+        return (book,), {}
+
+    benchmark.pedantic(lambda book: book.get_order_prices(), setup=add_orders, rounds=3)
+
+
+@pytest.mark.benchmark(group="get_order_prices")
+def test_batch_get_order_prices(benchmark, book_inputs):
+    static_data, market_data, orders = book_inputs
+
+    def add_orders():
+        book = BatchOrderBook(static_data)
+        book.add_orders(orders, market_data)
+        return (book,), {}
+
+    benchmark.pedantic(lambda book: book.get_order_prices(), setup=add_orders, rounds=3)
+
+
+@pytest.mark.benchmark(group="price_shock_effects")
+@pytest.mark.parametrize("n_steps", GRID_STEPS)
+def test_price_shock_effects(benchmark, priced_book, n_steps):
+    benchmark(priced_book.get_price_shock_effects, [-10, 10], [-10, 10], n_steps)
+
+
+@pytest.mark.benchmark(group="market_sensitivities")
+def test_per_order_market_sensitivities(benchmark, book_inputs):
+    # One reverse sweep per order, summed into the book totals
+    static_data, market_data, orders = book_inputs
+
+    def add_orders():
+        book = OrderBook(static_data)
+        book.add_orders(orders, market_data)
+        return (book,), {}
+
+    benchmark.pedantic(
+        lambda book: book.get_total_sensitivity(METALS.ZINC),
+        setup=add_orders,
+        rounds=3,
+    )
+
+
+@pytest.mark.benchmark(group="market_sensitivities")
+def test_book_graph_market_sensitivities(benchmark, book_inputs):
+    # One reverse sweep over the book-level graph with shared market price leaves
+    static_data, market_data, orders = book_inputs
+    book = OrderBook(static_data, compact_orders=True)
+    book.add_orders(orders, market_data)
+    benchmark.pedantic(book.get_market_sensitivities, rounds=3)
+
+
+@pytest.mark.benchmark(group="labour_factor")
+def test_labour_factor_lookup(benchmark):
+    static_data, _, _ = build_inputs(0)
+    rod_lengths = np.random.default_rng(0).uniform(1.0, 200.0, 1_000).tolist()
+    benchmark(lambda: [static_data.get_labour_factor(x) for x in rod_lengths])
+
+
+@pytest.mark.benchmark(group="labour_factor")
+def test_vectorised_labour_factor_lookup(benchmark):
+    static_data, _, _ = build_inputs(0)
+    rod_lengths = np.random.default_rng(0).uniform(1.0, 200.0, 1_000)
+    benchmark(static_data.get_labour_factors, rod_lengths)
+
+
+@pytest.mark.benchmark(group="import_time")
+@pytest.mark.parametrize("module", CORE_MODULES)
+def test_core_module_import(benchmark, module):
+    # Interpreter start up included, every round imports the module in a fresh process
+    command = [sys.executable, "-c", "import " + module]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    benchmark.pedantic(
+        subprocess.run, args=(command,), kwargs={"env": env, "check": True}, rounds=5
+    )
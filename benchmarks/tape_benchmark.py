@@ -0,0 +1,87 @@
+"""
+Compare the ComputationalNode reverse sweep along operand links with the Tape reverse sweep, on the brass price
+formula (DirectedAcyclicGraph) and on synthetic graphs of about 10k nodes.
+
+Run from the repository root with: `python benchmarks/tape_benchmark.py`
+"""
+# External dependencies
+import argparse
+import time
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.ComputationalNode import ComputationalNode
+from aad_pricing.pricing.DirectedAcyclicGraph import DirectedAcyclicGraph
+from aad_pricing.pricing.Tape import Tape
+from aad_pricing.static.Constants import METALS
+
+
+def brass_formula(n_graphs: int, use_tape: bool) -> float:
+    start = time.perf_counter()
+    for k in range(n_graphs):
+        graph = DirectedAcyclicGraph(
+            100.0 + k, 0.66, 8.22, 3.5, 1.15, use_tape=use_tape
+        )
+        graph.get_price()
+        graph.get_price_sensitivity(METALS.COPPER)
+        graph.get_price_sensitivity(METALS.ZINC)
+    return time.perf_counter() - start
+
+
+def wide_graph(variable, n_leaves: int):
+    # Pairwise products reduced as a balanced tree: ~3 nodes per leaf
+    rng = np.random.default_rng(0)
+    leaves = [variable(x) for x in rng.uniform(0.5, 1.5, n_leaves).tolist()]
+    terms = [leaves[i] * leaves[i + 1] for i in range(n_leaves - 1)]
+    while len(terms) > 1:
+        pairs = [terms[i] + terms[i + 1] for i in range(0, len(terms) - 1, 2)]
+        terms = pairs + terms[len(pairs) * 2 :]
+    return leaves, terms[0]
+
+
+def deep_graph(variable, n_links: int):
+    # A single chain of multiply-adds, the shape that breaks recursive sweeps
+    x, one = variable(1.00001), variable(1.0)
+    y = x
+    for _ in range(n_links):
+        y = y * x + one
+    return [x], y
+
+
+def sweep(make_graph, variable, size: int) -> float:
+    start = time.perf_counter()
+    leaves, output = make_graph(variable, size)
+    output.set_gradient(1.0)
+    for leaf in leaves:
+        leaf.get_gradient()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--graphs", type=int, default=10_000)
+    parser.add_argument("--nodes", type=int, default=10_000)
+    args = parser.parse_args()
+
+    node_time = brass_formula(args.graphs, use_tape=False)
+    tape_time = brass_formula(args.graphs, use_tape=True)
+    print(f"Brass formula x{args.graphs}")
+    print(
+        f"  nodes: {node_time:.4f} s, tape: {tape_time:.4f} s ({node_time / tape_time:.2f}x)"
+    )
+
+    for name, make_graph, size in (
+        ("Wide graph", wide_graph, args.nodes // 3),
+        ("Deep chain", deep_graph, args.nodes // 2),
+    ):
+        tape = Tape()
+        tape_time = sweep(make_graph, tape.variable, size)
+        node_time = sweep(make_graph, ComputationalNode, size)
+        print(f"{name} ({len(tape)} nodes)")
+        print(
+            f"  nodes: {node_time:.4f} s, tape: {tape_time:.4f} s ({node_time / tape_time:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
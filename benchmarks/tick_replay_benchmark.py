@@ -0,0 +1,91 @@
+"""
+Replay a synthetic intraday copper/zinc tick feed into a live order book and report ticks/second and the
+p50/p99 latency from tick ingestion until the book's totals are refreshed.
+
+Run from the repository root with: `python benchmarks/tick_replay_benchmark.py`
+"""
+# External dependencies
+import argparse
+import asyncio
+import time
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.external_input.MarketDataStream import (
+    MarketDataStream,
+    Tick,
+    replay_ticks,
+)
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.Constants import METALS, QUALITY
+from batch_pricing_benchmark import build_inputs
+
+
+def synthetic_ticks(n_ticks: int, copper_share: float, burst_size: int, seed=1):
+    # Random walks per (metal, quality); `burst_size` ticks share a timestamp
+    rng = np.random.default_rng(seed)
+    keys = [(METALS.COPPER, QUALITY.DEFAULT)] + [
+        (METALS.ZINC, QUALITY(q)) for q in QUALITY.get_all_qualities()
+    ]
+    zinc_share = (1.0 - copper_share) / (len(keys) - 1)
+    choices = rng.choice(
+        len(keys), size=n_ticks, p=[copper_share] + [zinc_share] * (len(keys) - 1)
+    )
+    prices = {keys[0]: 8.22, keys[1]: 7.5, keys[2]: 4.9, keys[3]: 3.5, keys[4]: 3.05}
+    moves = rng.normal(0.0, 0.001, n_ticks)
+    ticks = []
+    for k, (choice, move) in enumerate(zip(choices.tolist(), moves.tolist())):
+        metal, quality = keys[choice]
+        prices[keys[choice]] *= 1.0 + move
+        ticks.append(Tick(float(k // burst_size), metal, quality, prices[keys[choice]]))
+    return ticks
+
+
+def run(n_orders: int, ticks: list, asynchronous: bool) -> dict:
+    static_data, market_data, orders = build_inputs(n_orders)
+    book = OrderBook(static_data)
+    book.add_orders(orders, market_data)
+    book.get_total_price()
+    stream = MarketDataStream(market_data, book)
+
+    start = time.perf_counter()
+    if asynchronous:
+
+        async def consume():
+            async for _ in stream.aprocess(replay_ticks(ticks)):
+                pass
+
+        asyncio.run(consume())
+    else:
+        for _ in stream.process(ticks):
+            pass
+    elapsed = time.perf_counter() - start
+
+    statistics = stream.get_statistics()
+    statistics["ticks_per_second"] = len(ticks) / elapsed
+    return statistics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--ticks", type=int, default=2_000)
+    parser.add_argument("--copper-share", type=float, default=0.2)
+    parser.add_argument("--burst-size", type=int, default=1)
+    args = parser.parse_args()
+
+    ticks = synthetic_ticks(args.ticks, args.copper_share, args.burst_size)
+    print(
+        f"{'orders':>8} {'mode':>6} {'ticks/s':>10} {'updates':>8} {'p50 (ms)':>10} {'p99 (ms)':>10}"
+    )
+    for n_orders in args.orders:
+        for mode in ("sync", "async"):
+            stats = run(n_orders, ticks, asynchronous=mode == "async")
+            print(
+                f"{n_orders:>8} {mode:>6} {stats['ticks_per_second']:>10.1f} {stats['updates']:>8}"
+                f" {stats['latency_p50'] * 1e3:>10.3f} {stats['latency_p99'] * 1e3:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
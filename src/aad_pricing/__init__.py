@@ -1 +1,11 @@
-__all__ = ["external_input", "pricing", "static", "index"]
+# External dependencies
+import importlib
+
+__all__ = ["external_input", "pricing", "static", "cli", "index"]
+
+
+def __getattr__(name: str):
+    # Modules are imported on first access, importing the package itself stays cheap
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,47 @@
+// Price shock surface rendered in the browser, so dragging the shock sliders needs no server round trip.
+// The server publishes the aggregate copper and zinc sensitivities of the priced book and the figure layout,
+// this mirrors aad_pricing.pricing.OrderBook.price_shock_surface.
+
+// Same values as numpy.linspace
+function linspace(start, stop, n_steps) {
+    if (n_steps === 1) {
+        return [start];
+    }
+    const step = (stop - start) / (n_steps - 1);
+    const ladder = Array.from({length: n_steps}, (_, k) => start + k * step);
+    ladder[n_steps - 1] = stop;
+    return ladder;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    pricing: {
+        price_shock_figure: function(sensitivities, zinc_shock, copper_shock, layout) {
+            if (!sensitivities) {
+                const hidden_style = {display: "none"};
+                return [{data: [], layout: layout}, hidden_style, hidden_style];
+            }
+
+            // Ladders in percentages, price change grid indexed as [zinc step, copper step]
+            const zinc_shock_ladder = linspace(zinc_shock[0], zinc_shock[1], sensitivities.n_steps);
+            const copper_shock_ladder = linspace(copper_shock[0], copper_shock[1], sensitivities.n_steps);
+            const copper_change = copper_shock_ladder.map(x => sensitivities.copper * (x / 100.0));
+            const price_change = zinc_shock_ladder.map(function(y) {
+                const zinc_change = sensitivities.zinc * (y / 100.0);
+                return copper_change.map(x => zinc_change + x);
+            });
+
+            const figure = {
+                data: [{
+                    type: "contour",
+                    x: copper_shock_ladder,
+                    y: zinc_shock_ladder,
+                    z: price_change,
+                    colorbar: {title: {text: "Price change ($)"}},
+                }],
+                layout: layout,
+            };
+            const display_style = {display: "block"};
+            return [figure, display_style, display_style];
+        },
+    },
+});
@@ -0,0 +1,228 @@
+# External dependencies
+import argparse
+import json
+import sys
+import time
+
+# Internal dependencies
+# The command line interface doesn't import Dash, Plotly or Flask, so it starts up fast
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+from aad_pricing.external_input.OrderFile import price_order_file, write_shock_grid
+from aad_pricing.pricing.ShardedExecutor import ShardedExecutor
+
+# Same defaults as the web interface
+DEFAULT_COPPER_FRACTION = 0.66
+DEFAULT_LABOUR_FACTORS = ["0:1.05", "75:1.1", "100:1.15", "125:1.25"]
+DEFAULT_COPPER_PRICE = 8.22
+DEFAULT_ZINC_PRICES = ["AA=7.5", "A=4.9", "B=3.5", "C=3.05"]
+DEFAULT_PRICE_SHOCK = [-10.0, 10.0]
+
+
+def parse_labour_factor(text: str) -> tuple:
+    # "min_length:labour_factor"
+    try:
+        length, factor = text.split(":")
+        return float(length), float(factor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Labour factors are given as min_length:labour_factor, e.g. 75:1.1"
+        )
+
+
+def parse_zinc_price(text: str) -> tuple:
+    # "quality=price"
+    try:
+        quality, price = text.split("=")
+        return quality.strip().upper(), float(price)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Zinc prices are given as quality=price, e.g. AA=7.5"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="my-cli",
+        description="Price a CSV or Parquet file of brass rod orders and write the prices and copper/zinc "
+        "sensitivities to a CSV or Parquet file. The file format follows the file extension. "
+        "Static and market data are read from JSON files, options on the command line take precedence.",
+    )
+    parser.add_argument(
+        "orders", help="Order file with client, weight, rod_length, zinc_quality"
+    )
+    parser.add_argument("-o", "--output", required=True, help="Priced order file")
+
+    data = parser.add_argument_group("static and market data")
+    data.add_argument(
+        "--static-data",
+        help='JSON file, e.g. {"copper_fraction": 0.66, "labour_factors": [[0, 1.05], [75, 1.1]]}',
+    )
+    data.add_argument(
+        "--market-data",
+        help='JSON file, e.g. {"copper": 8.22, "zinc": {"AA": 7.5, "A": 4.9, "B": 3.5, "C": 3.05}}',
+    )
+    data.add_argument("--copper-fraction", type=float)
+    data.add_argument(
+        "--labour-factors",
+        type=parse_labour_factor,
+        nargs="+",
+        metavar="MIN_LENGTH:FACTOR",
+    )
+    data.add_argument("--copper-price", type=float)
+    data.add_argument(
+        "--zinc-prices", type=parse_zinc_price, nargs="+", metavar="QUALITY=PRICE"
+    )
+
+    shocks = parser.add_argument_group("price shock grid")
+    shocks.add_argument(
+        "--shock-grid", help="Write the book price change per zinc and copper shock"
+    )
+    shocks.add_argument(
+        "--zinc-shock", type=float, nargs=2, default=DEFAULT_PRICE_SHOCK, metavar="%"
+    )
+    shocks.add_argument(
+        "--copper-shock", type=float, nargs=2, default=DEFAULT_PRICE_SHOCK, metavar="%"
+    )
+    shocks.add_argument("--shock-steps", type=int, default=100)
+
+    performance = parser.add_argument_group("performance")
+    performance.add_argument(
+        "--workers", type=int, default=1, help="Threads pricing shards of each chunk"
+    )
+    performance.add_argument("--chunk-size", type=int, default=100_000)
+    performance.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Profile the run with cProfile, print the top functions or save the stats to FILE",
+    )
+    return parser
+
+
+def load_json(path: str) -> dict:
+    if path is None:
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def build_data(args: argparse.Namespace) -> tuple:
+    static_file, market_file = load_json(args.static_data), load_json(args.market_data)
+
+    copper_fraction = args.copper_fraction
+    if copper_fraction is None:
+        copper_fraction = static_file.get("copper_fraction", DEFAULT_COPPER_FRACTION)
+    labour_factors = args.labour_factors or [
+        tuple(x) for x in static_file.get("labour_factors", [])
+    ]
+    labour_factors = labour_factors or [
+        parse_labour_factor(x) for x in DEFAULT_LABOUR_FACTORS
+    ]
+    copper_price = args.copper_price
+    if copper_price is None:
+        copper_price = market_file.get("copper", DEFAULT_COPPER_PRICE)
+    zinc_prices = dict(parse_zinc_price(x) for x in DEFAULT_ZINC_PRICES)
+    zinc_prices.update(
+        {q.upper(): float(p) for q, p in market_file.get("zinc", {}).items()}
+    )
+    zinc_prices.update(args.zinc_prices or [])
+
+    static_data = StaticData()
+    static_data.set_copper_fraction(copper_fraction)
+    static_data.set_labour_factors(labour_factors)
+
+    market_data = MarketData()
+    market_data.set_price(copper_price, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zinc_prices.items():
+        if quality not in QUALITY.get_all_qualities():
+            raise ValueError("Unknown zinc quality: " + quality)
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+    return static_data, market_data
+
+
+def peak_memory_mb() -> float:
+    # Peak resident set size of the process, not available on Windows
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024.0**2 if sys.platform == "darwin" else 1024.0)
+
+
+def price_files(args: argparse.Namespace) -> dict:
+    static_data, market_data = build_data(args)
+    executor = None
+    if args.workers > 1:
+        shard_size = -(-args.chunk_size // args.workers)
+        executor = ShardedExecutor(args.workers, shard_size, backend="thread")
+    try:
+        summary = price_order_file(
+            args.orders,
+            args.output,
+            static_data,
+            market_data,
+            args.chunk_size,
+            executor,
+        )
+    finally:
+        if executor is not None:
+            executor.close()
+
+    if args.shock_grid is not None:
+        write_shock_grid(
+            args.shock_grid,
+            summary["zinc_sensitivity"],
+            summary["copper_sensitivity"],
+            args.zinc_shock,
+            args.copper_shock,
+            args.shock_steps,
+        )
+    return summary
+
+
+def run(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    profiler = None
+    if args.profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        summary = price_files(args)
+    except (ValueError, KeyError, OSError, ImportError) as error:
+        print(f"my-cli: error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Priced {summary['orders']} orders in {summary['chunks']} chunks to {args.output}\n"
+        f"Total price: {summary['total_price']:,.2f}\n"
+        f"Copper sensitivity: {summary['copper_sensitivity']:,.2f}\n"
+        f"Zinc sensitivity: {summary['zinc_sensitivity']:,.2f}\n"
+        f"Elapsed: {elapsed:.3f} s, {summary['orders'] / elapsed:,.0f} orders/s\n"
+        f"Peak memory: {peak_memory_mb():,.1f} MB"
+    )
+    if profiler is not None:
+        if args.profile == "-":
+            import pstats
+
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        else:
+            profiler.dump_stats(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -3,6 +3,13 @@ from aad_pricing.static.StaticData import StaticData
 from aad_pricing.static.Constants import METALS, QUALITY
 from aad_pricing.external_input.MarketData import MarketData
 from aad_pricing.pricing.DirectedAcyclicGraph import DirectedAcyclicGraph
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION
+from aad_pricing.pricing.PricingCache import (
+    PricingCache,
+    PricingResult,
+    price_graph,
+    pricing_key,
+)
 
 
 class ClientOrder(object):
@@ -17,8 +24,28 @@ class ClientOrder(object):
      to compute the order price and sensitivities.
 
      Static data and market data are tied to each object instance, allowing different market prices per client order.
+
+     With a PricingCache, price and sensitivities are looked up by order parameters and data snapshots, and
+     the graph is only built on a cache miss or when gammas or shocked prices are requested.
+
+     A compact order keeps only its price and sensitivities once the reverse sweep is done and drops the graph,
+     which is rebuilt on demand for gammas and shocked prices.
     """
 
+    __slots__ = (
+        "_client_name",
+        "_weight",
+        "_rod_length",
+        "_zinc_quality",
+        "_static_data",
+        "_market_data",
+        "_pricing_cache",
+        "_compact",
+        "_inputs",
+        "_graph",
+        "_result",
+    )
+
     def __init__(
         self,
         client_name: str,
@@ -27,43 +54,128 @@ class ClientOrder(object):
         zinc_quality: str,
         static_data: StaticData,
         market_data: MarketData,
+        pricing_cache: PricingCache = None,
+        compact: bool = False,
     ) -> None:
         # Unique client id
         self._client_name = client_name
-        #  Directed acyclic graph to compute order price and sensitivity
-        self._graph = self._compose_graph(
-            static_data, market_data, weight, zinc_quality, rod_length
-        )
+        # Order parameters, kept to reprice the order when static or market data change
+        self._weight = weight
+        self._rod_length = rod_length
+        self._zinc_quality = zinc_quality
+        self._static_data = static_data
+        self._market_data = market_data
+        self._pricing_cache = pricing_cache
+        self._compact = compact
+        # Graph inputs resolved from the order parameters, static and market data
+        self._inputs = self._resolve_inputs()
+        #  Directed acyclic graph to compute order price and sensitivity, or the cached or compact result
+        self._graph = None
+        self._result = None
+        self._price(self._inputs)
 
-    def _compose_graph(
-        self,
-        static_data: StaticData,
-        market_data: MarketData,
-        weight: float,
-        zinc_quality: str,
-        rod_length: float,
-    ) -> None:
-        copper_fraction = static_data.get_alloy_mass_fraction(METALS.COPPER)
-        copper_price = market_data.get_price(METALS.COPPER)
-        quality = QUALITY(zinc_quality)
-        zinc_price = market_data.get_price(METALS.ZINC, quality=quality)
-        labour_factor = static_data.get_labour_factor(rod_length)
-
-        return DirectedAcyclicGraph(
-            weight,
+    def _resolve_inputs(self) -> tuple:
+        copper_fraction = self._static_data.get_alloy_mass_fraction(METALS.COPPER)
+        copper_price = self._market_data.get_price(METALS.COPPER)
+        quality = QUALITY.from_value(self._zinc_quality)
+        zinc_price = self._market_data.get_price(METALS.ZINC, quality=quality)
+        labour_factor = self._static_data.get_labour_factor(self._rod_length)
+
+        return (
+            self._weight,
             copper_fraction,
             copper_price,
             zinc_price,
             labour_factor,
         )
 
+    @INSTRUMENTATION.timed("graph_build")
+    def _compose_graph(self, inputs: tuple) -> DirectedAcyclicGraph:
+        return DirectedAcyclicGraph(*inputs)
+
+    def _price(self, inputs: tuple) -> None:
+        if self._compact and self._pricing_cache is None:
+            # Collapse the order to (price, copper sensitivity, zinc sensitivity) after the sweep
+            self._graph = None
+            self._result = price_graph(self._compose_graph(inputs))
+            return
+        if self._pricing_cache is None:
+            self._graph = self._compose_graph(inputs)
+            return
+        key = pricing_key(
+            self._weight,
+            self._rod_length,
+            self._zinc_quality,
+            self._static_data,
+            self._market_data,
+        )
+        self._graph = None
+        self._result = self._pricing_cache.get_or_price(
+            key, lambda: price_graph(self._compose_graph(inputs))
+        )
+
+    def _get_graph(self) -> DirectedAcyclicGraph:
+        if self._graph is not None:
+            return self._graph
+        graph = self._compose_graph(self._inputs)
+        # Compact orders don't hold on to the rebuilt graph
+        if not self._compact:
+            self._graph = graph
+        return graph
+
+    def reprice(
+        self, static_data: StaticData = None, market_data: MarketData = None
+    ) -> bool:
+        # Rebuild the graph only if one of its inputs changed, returns whether the order was repriced
+        if static_data is not None:
+            self._static_data = static_data
+        if market_data is not None:
+            self._market_data = market_data
+
+        inputs = self._resolve_inputs()
+        if inputs == self._inputs:
+            return False
+        self._inputs = inputs
+        self._price(inputs)
+        return True
+
+    def get_order_parameters(self) -> list:
+        return [self._client_name, self._weight, self._rod_length, self._zinc_quality]
+
     def get_name(self) -> str:
         return self._client_name
 
+    def get_rod_length(self) -> float:
+        return self._rod_length
+
+    def get_graph_inputs(self) -> tuple:
+        # (total weight, copper fraction, copper price, zinc price, labour factor)
+        return self._inputs
+
+    def get_zinc_quality(self) -> QUALITY:
+        return QUALITY.from_value(self._zinc_quality)
+
+    def get_pricing_result(self) -> PricingResult:
+        if self._result is not None:
+            return self._result
+        return price_graph(self._graph)
+
     def get_price(self) -> float:
-        return self._graph.get_price() if self._graph is not None else 0.0
+        if self._result is not None:
+            return self._result.price
+        return self._graph.get_price()
 
     def get_sensitivity(self, metal: METALS) -> float:
-        return (
-            self._graph.get_price_sensitivity(metal) if self._graph is not None else 0.0
-        )
+        if self._result is not None:
+            return self._result.get_sensitivity(metal)
+        return self._graph.get_price_sensitivity(metal)
+
+    def get_jacobian(self) -> dict:
+        # Price derivatives w.r.t. all graph inputs, compact and cached orders rebuild their graph
+        return self._get_graph().get_jacobian()
+
+    def get_gamma(self, metal_a: METALS, metal_b: METALS) -> float:
+        return self._get_graph().get_price_gamma(metal_a, metal_b)
+
+    def get_shocked_price(self, copper_shock, zinc_shock) -> float:
+        return self._get_graph().get_shocked_price(copper_shock, zinc_shock)
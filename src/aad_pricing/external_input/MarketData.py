@@ -1,28 +1,34 @@
 # External dependencies
 import numbers
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Tuple
 
 # Internal dependencies
-from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.static.Constants import METALS, METAL_CODES, QUALITY
+from aad_pricing.static.Observable import Observable
+from aad_pricing.static.Snapshot import Snapshot
 
 
-class MarketData(object):
+class MarketData(Observable):
     """
     Class MarketData contains snapshots of the copper and zinc prices in USD/kg.
     Zinc pricing is denominated into categories separated by metal quality.
+
+    Listeners are notified with (metal, quality) after every price update, so dependent order books
+    can reprice the affected orders only.
     """
 
     def __init__(self) -> None:
+        super().__init__()
         # Market prices: {METALS (enum): {QUALITY (enum): price (float)} }
         self._prices = {}
+        # Snapshot of the current prices, taken on demand and reset by every update
+        self._snapshot = None
 
     def market_data_validator(setter_func):
         def function_wrapper(self, price: float, metal: str, quality: str):
-            if not METALS.from_string(metal) in [x.value for x in METALS]:
-                raise KeyError("Metal is not recognised")
-            if not isinstance(price, numbers.Number) or price <= 0.0:
-                raise ValueError("Price must be a positive numeric value")
-            if QUALITY(quality) is None:
-                raise ValueError("No metal quality indicated")
+            validate_price(price, metal, quality)
 
             return setter_func(self, price, metal, quality)
 
@@ -34,6 +40,60 @@ class MarketData(object):
             self._prices.setdefault(metal, dict())
 
         self._prices[metal][quality] = price
+        self._snapshot = None
+        self._notify_listeners(metal, quality)
+
+    def set_validated_prices(self, prices: dict) -> None:
+        # Bulk update of {(metal, quality): price} entries that were validated on ingestion.
+        # All prices are set before listeners are notified, so dependents see a consistent snapshot.
+        for (metal, quality), price in prices.items():
+            self._prices.setdefault(metal, dict())[quality] = price
+        self._snapshot = None
+        for metal, quality in prices:
+            self._notify_listeners(metal, quality)
 
     def get_price(self, metal: METALS, quality: QUALITY = QUALITY.DEFAULT) -> float:
         return self._prices.get(metal, {}).get(quality, 0.0)
+
+    def snapshot(self) -> "MarketDataSnapshot":
+        if self._snapshot is None:
+            self._snapshot = MarketDataSnapshot(
+                tuple(
+                    sorted(
+                        (metal, QUALITY.from_value(quality).name, float(price))
+                        for metal, prices in self._prices.items()
+                        for quality, price in prices.items()
+                    )
+                )
+            )
+        return self._snapshot
+
+
+@dataclass(frozen=True)
+class MarketDataSnapshot(Snapshot):
+    """
+    Class MarketDataSnapshot is an immutable copy of the prices in MarketData, as sorted (metal, quality name, price) entries.
+
+    It provides MarketData.get_price, so it can be passed to ClientOrder instead of the live market data.
+    """
+
+    prices: Tuple[Tuple[str, str, float], ...]
+
+    def _canonical(self) -> tuple:
+        return self.prices
+
+    @cached_property
+    def _price_lookup(self) -> dict:
+        return {(metal, QUALITY[name]): price for metal, name, price in self.prices}
+
+    def get_price(self, metal: METALS, quality: QUALITY = QUALITY.DEFAULT) -> float:
+        return self._price_lookup.get((metal, QUALITY.from_value(quality)), 0.0)
+
+
+def validate_price(price: float, metal: str, quality: str) -> None:
+    if METALS.from_string(metal) not in METAL_CODES:
+        raise KeyError("Metal is not recognised")
+    if not isinstance(price, numbers.Number) or price <= 0.0:
+        raise ValueError("Price must be a positive numeric value")
+    if QUALITY.from_value(quality) is None:
+        raise ValueError("No metal quality indicated")
@@ -0,0 +1,152 @@
+# External dependencies
+import asyncio
+import csv
+import time
+from typing import AsyncIterator, Iterable, Iterator, List, NamedTuple
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.external_input.MarketData import MarketData, validate_price
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.Constants import METALS, QUALITY
+
+
+class Tick(NamedTuple):
+    # Seconds since the start of the feed
+    timestamp: float
+    metal: str
+    quality: QUALITY
+    # Price in USD/kg
+    price: float
+
+
+def parse_tick(timestamp, metal: str, quality: str, price) -> Tick:
+    # Validate once on ingestion, so ticks are applied to MarketData without validating again
+    price = float(price)
+    metal = METALS.from_string(metal)
+    quality = QUALITY.from_value(
+        quality.upper() if isinstance(quality, str) else quality
+    )
+    validate_price(price, metal, quality)
+    return Tick(float(timestamp), metal, quality, price)
+
+
+def read_ticks(lines: Iterable[str]) -> Iterator[Tick]:
+    # CSV rows of timestamp,metal,quality,price, e.g. from an open file. A header row is skipped.
+    for row in csv.reader(lines):
+        if len(row) == 0 or row[0].strip().lower() == "timestamp":
+            continue
+        yield parse_tick(*row)
+
+
+async def replay_ticks(
+    ticks: Iterable[Tick], speed: float = None
+) -> AsyncIterator[Tick]:
+    # Replay recorded ticks as an async feed, in real time scaled by `speed`, or as fast as possible
+    previous = None
+    for tick in ticks:
+        if speed is not None and previous is not None:
+            await asyncio.sleep(max(tick.timestamp - previous, 0.0) / speed)
+        else:
+            # Let consumers run between ticks, like a socket would
+            await asyncio.sleep(0)
+        previous = tick.timestamp
+        yield tick
+
+
+class MarketDataStream(object):
+    """
+    Class MarketDataStream feeds intraday market data ticks into a MarketData object and keeps an OrderBook
+    that listens to it live.
+
+    Bursts of ticks are coalesced to the last price per (metal, quality) and applied as one update. The order
+    book reprices the dependent orders only, and its total price and aggregate sensitivities are refreshed
+    after every update. The latency of every tick, from ingestion to refreshed totals, is recorded.
+    """
+
+    def __init__(
+        self, market_data: MarketData, order_book: OrderBook, max_batch: int = 1000
+    ) -> None:
+        self._market_data = market_data
+        self._order_book = order_book
+        self._max_batch = max_batch
+        self._latencies = []
+        self._n_updates = 0
+        # Ids of the orders changed by the update being applied
+        self._changed = set()
+        order_book.add_listener(self._on_orders_changed)
+
+    def _on_orders_changed(self, order_ids: set) -> None:
+        self._changed.update(order_ids)
+
+    def _apply(self, prices: dict, arrival_times: List[float]) -> set:
+        self._changed = set()
+        self._market_data.set_validated_prices(prices)
+        # Refresh the running totals, so the book is live when the update returns
+        self._order_book.get_total_price()
+
+        done = time.perf_counter()
+        self._latencies.extend(done - arrival for arrival in arrival_times)
+        self._n_updates += 1
+        return self._changed
+
+    def process(self, ticks: Iterable[Tick], window: float = 0.0) -> Iterator[set]:
+        # Synchronous replay: ticks within `window` seconds of the first tick of a burst are coalesced
+        # to the last price per (metal, quality). Yields the ids of the orders changed by every update.
+        prices, arrival_times, burst_start = {}, [], None
+        for tick in ticks:
+            arrival = time.perf_counter()
+            if prices and (
+                tick.timestamp - burst_start > window
+                or len(arrival_times) >= self._max_batch
+            ):
+                yield self._apply(prices, arrival_times)
+                prices, arrival_times = {}, []
+            if not prices:
+                burst_start = tick.timestamp
+            prices[(tick.metal, tick.quality)] = tick.price
+            arrival_times.append(arrival)
+        if prices:
+            yield self._apply(prices, arrival_times)
+
+    async def aprocess(self, ticks: AsyncIterator[Tick]) -> AsyncIterator[set]:
+        # Asynchronous feed: every tick that arrived while the previous update was applied forms one burst
+        queue = asyncio.Queue()
+
+        async def produce():
+            try:
+                async for tick in ticks:
+                    queue.put_nowait((tick, time.perf_counter()))
+            finally:
+                # Also wake the consumer when the tick source fails, so it can raise the error
+                queue.put_nowait(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            finished = False
+            while not finished:
+                items = [await queue.get()]
+                while not queue.empty() and len(items) < self._max_batch:
+                    items.append(queue.get_nowait())
+                if items[-1] is None:
+                    finished = True
+                    items.pop()
+                if items:
+                    prices = {(t.metal, t.quality): t.price for t, _ in items}
+                    yield self._apply(prices, [arrival for _, arrival in items])
+            # Ticks received before a failure are applied, then the error of the tick source is raised
+            await producer
+        finally:
+            producer.cancel()
+
+    def get_statistics(self) -> dict:
+        # Tick latencies in seconds, from ingestion until the order book totals are refreshed
+        latency_p50, latency_p99 = (
+            np.percentile(self._latencies, [50, 99]) if self._latencies else (0.0, 0.0)
+        )
+        return {
+            "ticks": len(self._latencies),
+            "updates": self._n_updates,
+            "latency_p50": float(latency_p50),
+            "latency_p99": float(latency_p99),
+        }
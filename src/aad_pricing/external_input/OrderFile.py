@@ -0,0 +1,250 @@
+# External dependencies
+import pathlib
+from typing import Iterator, NamedTuple
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY, QUALITY_CODES
+from aad_pricing.external_input.MarketData import MarketData
+from aad_pricing.pricing.BatchOrderBook import BatchOrderBook
+from aad_pricing.pricing.OrderBook import price_shock_surface
+
+# Columns of an order file. An optional "order_id" column identifies the orders, row numbers are used otherwise.
+ORDER_COLUMNS = ("client", "weight", "rod_length", "zinc_quality")
+# Zinc quality names in order files -> quality codes
+QUALITY_NAME_CODES = {
+    q.value: code for q, code in QUALITY_CODES.items() if q != QUALITY.DEFAULT
+}
+
+
+class OrderChunk(NamedTuple):
+    order_ids: np.ndarray
+    client_names: np.ndarray
+    weights: np.ndarray
+    rod_lengths: np.ndarray
+    quality_codes: np.ndarray
+
+
+def import_pandas():
+    # Imported on first use, so the pricing library doesn't depend on pandas
+    try:
+        import pandas
+    except ImportError as error:
+        raise ImportError(
+            "Reading and writing order files requires pandas, install it with `pip install pandas`"
+        ) from error
+    return pandas
+
+
+def import_parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            "Parquet order files require pyarrow, install the parquet extra with `pip install aad-pricing[parquet]`"
+        ) from error
+    return pyarrow, pyarrow.parquet
+
+
+def file_format(path) -> str:
+    suffixes = pathlib.Path(path).suffixes
+    return "parquet" if ".parquet" in suffixes or ".pq" in suffixes else "csv"
+
+
+def read_order_chunks(
+    path, chunk_size: int = 100_000, static_data: StaticData = None
+) -> Iterator[OrderChunk]:
+    # Stream a CSV or Parquet order file in validated chunks of at most chunk_size orders. With static_data,
+    # rod lengths are also checked against its labour factor table.
+    pandas = import_pandas()
+    if file_format(path) == "parquet":
+        _, parquet = import_parquet()
+        frames = (
+            batch.to_pandas()
+            for batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_size)
+        )
+    else:
+        frames = pandas.read_csv(
+            path,
+            chunksize=chunk_size,
+            skipinitialspace=True,
+            dtype={"client": str, "zinc_quality": str},
+        )
+
+    offset = 0
+    for frame in frames:
+        yield validate_order_frame(frame, offset, path, static_data)
+        offset += len(frame)
+
+
+def validate_order_frame(
+    frame, offset: int, source, static_data: StaticData = None
+) -> OrderChunk:
+    # Bulk validation of one chunk of an order file, rows are numbered from the first order in the file
+    pandas = import_pandas()
+    missing = [column for column in ORDER_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Order file {source} is missing columns {missing}")
+
+    rows = np.arange(offset, offset + len(frame))
+    weights = pandas.to_numeric(frame["weight"], errors="coerce").to_numpy(float)
+    rod_lengths = pandas.to_numeric(frame["rod_length"], errors="coerce").to_numpy(
+        float
+    )
+    quality_codes = (
+        frame["zinc_quality"]
+        .astype(str)
+        .str.strip()
+        .str.upper()
+        .map(QUALITY_NAME_CODES)
+    )
+    # Lengths below the first labour factor breakpoint have no labour factor
+    labour_factors = (
+        [] if static_data is None else static_data.get_labour_factor_table()
+    )
+    min_rod_length = labour_factors[0][0] if labour_factors else -np.inf
+    # Comparisons with NaN are False, so missing and non-numeric values are rejected too
+    check_order_column(~(weights > 0.0), "weight", rows, source)
+    check_order_column(
+        ~((rod_lengths > 0.0) & (rod_lengths >= min_rod_length)),
+        "rod_length",
+        rows,
+        source,
+    )
+    check_order_column(quality_codes.isna().to_numpy(), "zinc_quality", rows, source)
+
+    order_ids = frame["order_id"].to_numpy() if "order_id" in frame.columns else rows
+    return OrderChunk(
+        order_ids,
+        frame["client"].fillna("").astype(str).to_numpy(object),
+        weights,
+        rod_lengths,
+        quality_codes.to_numpy(np.int8),
+    )
+
+
+def check_order_column(invalid: np.ndarray, column: str, rows: np.ndarray, source):
+    if invalid.any():
+        raise ValueError(
+            f"Invalid {column} in order file {source}, rows {rows[invalid][:10].tolist()}"
+        )
+
+
+class OrderFileWriter(object):
+    """
+    Class OrderFileWriter writes chunks of columns, e.g. priced orders, to a CSV or Parquet file as they are
+    computed, so a whole book never has to be held in memory.
+    """
+
+    def __init__(self, path) -> None:
+        self._path = path
+        self._format = file_format(path)
+        self._parquet_writer = None
+        self._n_rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, columns: dict) -> None:
+        if self._format == "parquet":
+            pyarrow, parquet = import_parquet()
+            table = pyarrow.table(columns)
+            if self._parquet_writer is None:
+                self._parquet_writer = parquet.ParquetWriter(self._path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            first_chunk = self._n_rows == 0
+            import_pandas().DataFrame(columns).to_csv(
+                self._path,
+                mode="w" if first_chunk else "a",
+                header=first_chunk,
+                index=False,
+            )
+        self._n_rows += len(next(iter(columns.values())))
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def price_order_chunk(
+    chunk: OrderChunk, static_data: StaticData, market_data: MarketData, executor=None
+) -> dict:
+    book = BatchOrderBook(static_data, executor=executor)
+    # Rows are priced as they are, ids repeated in the file don't overwrite each other
+    book.add_order_columns(
+        np.arange(len(chunk.weights)),
+        chunk.client_names,
+        chunk.weights,
+        chunk.rod_lengths,
+        chunk.quality_codes,
+        market_data,
+    )
+    return {
+        "order_id": chunk.order_ids,
+        "client": chunk.client_names,
+        "price": book.get_prices(),
+        "copper_sensitivity": book.get_sensitivities(METALS.COPPER),
+        "zinc_sensitivity": book.get_sensitivities(METALS.ZINC),
+    }
+
+
+def price_order_file(
+    input_path,
+    output_path,
+    static_data: StaticData,
+    market_data: MarketData,
+    chunk_size: int = 100_000,
+    executor=None,
+) -> dict:
+    # Price an order file chunk by chunk with bounded memory and write prices and sensitivities to output_path.
+    # Returns the number of orders and the book totals.
+    summary = {"orders": 0, "chunks": 0}
+    totals = {"price": 0.0, "copper_sensitivity": 0.0, "zinc_sensitivity": 0.0}
+    with OrderFileWriter(output_path) as writer:
+        for chunk in read_order_chunks(input_path, chunk_size, static_data):
+            priced = price_order_chunk(chunk, static_data, market_data, executor)
+            writer.write(priced)
+            summary["orders"] += len(priced["price"])
+            summary["chunks"] += 1
+            for column in totals:
+                totals[column] += float(priced[column].sum())
+
+    summary["total_price"] = totals.pop("price")
+    summary.update(totals)
+    return summary
+
+
+def write_shock_grid(
+    path,
+    zinc_sensitivity: float,
+    copper_sensitivity: float,
+    zinc_shock_percentages: list,
+    copper_shock_percentages: list,
+    n_steps: int,
+) -> None:
+    # Book price change for every (zinc shock, copper shock) combination, one row per grid point
+    zinc_shock_ladder, copper_shock_ladder, price_change = price_shock_surface(
+        zinc_sensitivity,
+        copper_sensitivity,
+        zinc_shock_percentages,
+        copper_shock_percentages,
+        n_steps,
+    )
+    zinc_shocks, copper_shocks = np.meshgrid(
+        zinc_shock_ladder, copper_shock_ladder, indexing="ij"
+    )
+    with OrderFileWriter(path) as writer:
+        writer.write(
+            {
+                "zinc_shock_pct": zinc_shocks.ravel(),
+                "copper_shock_pct": copper_shocks.ravel(),
+                "price_change": price_change.ravel(),
+            }
+        )
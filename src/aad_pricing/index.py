@@ -1,17 +1,21 @@
 # External dependencies
 from dash import Dash, html, dcc, dash_table, Output, Input, State, callback, html, dcc
+from dash import ClientsideFunction
 from dash.dash_table import FormatTemplate
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
-import plotly.express as px
-import numpy as np
 import flask
+import os
+import time
+import uuid
 
 # Internal dependencies
 from aad_pricing.static.StaticData import StaticData
 from aad_pricing.static.Constants import METALS, QUALITY
 from aad_pricing.external_input.MarketData import MarketData
 from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.pricing.ResultStore import BookResult, ResultStore, input_hash
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION, METRICS_VARIABLE
 
 server = flask.Flask(__name__)
 dash_app = Dash(__name__, external_stylesheets=[dbc.themes.FLATLY], server=server)
@@ -364,17 +368,87 @@ content = html.Div(
     style={"overflow": "scroll"},
 )
 
-dash_app.layout = dbc.Container(
-    [
-        dbc.Row(
-            [
-                dbc.Col(sidebar, width=4, className="bg-light"),
-                dbc.Col(content, width=8),
-            ]
-        ),
-    ],
-    fluid=True,
-)
+# Server-side pricing results per browser session, keyed by a hash of the inputs
+RESULT_STORE = ResultStore()
+
+# Number of steps of the shock ladders
+PRICE_SHOCK_STEPS = 250
+
+
+# Timers and counters of the pricing library are internal, the endpoint is only served when instrumentation is
+# switched on at start up with AAD_PRICING_INSTRUMENTATION=1, or explicitly with AAD_PRICING_METRICS=1
+if INSTRUMENTATION.enabled or os.environ.get(METRICS_VARIABLE, "") not in ("", "0"):
+
+    @server.route("/metrics")
+    def metrics():
+        return flask.Response(
+            INSTRUMENTATION.prometheus_text(), mimetype="text/plain; version=0.0.4"
+        )
+
+
+@server.before_request
+def start_response_timer():
+    if INSTRUMENTATION.enabled:
+        flask.g.response_start = time.perf_counter()
+
+
+@server.after_request
+def record_callback_response(response):
+    # Time and size of Dash callback responses, as serialized by Dash itself. Callbacks are identified by
+    # their outputs.
+    start = flask.g.get("response_start")
+    if start is not None and flask.request.path.endswith("/_dash-update-component"):
+        output = (flask.request.get_json(silent=True) or {}).get("output", "")
+        INSTRUMENTATION.record_response(
+            output,
+            time.perf_counter() - start,
+            response.calculate_content_length() or 0,
+        )
+    return response
+
+
+def price_shock_layout() -> dict:
+    # Layout of the price shock figure, built once at import. The contour data is added in the browser, so
+    # no figure is built per request.
+    fig = go.Figure()
+    fig.update_yaxes(
+        title_text="Zinc price change (%)", title_font={"size": 20}, title_standoff=15
+    )
+    fig.update_xaxes(
+        title_text="Copper price change (%)", title_font={"size": 20}, title_standoff=15
+    )
+
+    fig.update_layout(
+        title_text="Client order price sensitivity ($)",
+        title_font={"size": 20},
+        title_x=0.45,
+    )
+    return fig.to_dict()["layout"]
+
+
+PRICE_SHOCK_LAYOUT = price_shock_layout()
+
+
+def serve_layout():
+    # Every page load gets a new session id
+    return dbc.Container(
+        [
+            dbc.Row(
+                [
+                    dbc.Col(sidebar, width=4, className="bg-light"),
+                    dbc.Col(content, width=8),
+                ]
+            ),
+            dcc.Store(id="session-id", data=str(uuid.uuid4())),
+            # Aggregate sensitivities of the last priced order book
+            dcc.Store(id="book-sensitivities"),
+            dcc.Store(id="price-shock-layout", data=PRICE_SHOCK_LAYOUT),
+        ],
+        fluid=True,
+    )
+
+
+dash_app.layout = serve_layout
 
 
 def extract_order_parameters(data_table):
@@ -390,6 +464,7 @@ def extract_order_parameters(data_table):
     }
 
 
+@INSTRUMENTATION.timed("extract_market_and_static_data")
 def extract_market_and_static_data(
     copper_fraction: float, labour_factors, copper_price: float, zinc_prices
 ):
@@ -422,117 +497,97 @@ def extract_market_and_static_data(
     return static_data, market_data
 
 
+@INSTRUMENTATION.timed("book_pricing")
+def price_order_book(
+    session_id, order_data, copper_fraction, labour_factors, copper_price, zinc_prices
+):
+    # Price the book once per input change
+    static_data, market_data = extract_market_and_static_data(
+        copper_fraction=copper_fraction,
+        labour_factors=labour_factors,
+        copper_price=copper_price,
+        zinc_prices=zinc_prices,
+    )
+    order_dict = extract_order_parameters(order_data)
+    key = input_hash(order_dict, static_data, market_data)
+
+    result = RESULT_STORE.get(session_id, key)
+    if result is None:
+        orderbook = OrderBook(static_data=static_data)
+        orderbook.add_orders(order_dict, market_data=market_data)
+        result = BookResult(
+            orderbook.get_order_prices(),
+            orderbook.get_total_sensitivity(METALS.COPPER),
+            orderbook.get_total_sensitivity(METALS.ZINC),
+        )
+        RESULT_STORE.put(session_id, key, result)
+    return result
+
+
 # Display client prices
 @callback(
     Output("client-order-prices", "data"),
+    Output("book-sensitivities", "data"),
     Input("run-price-calculation-button", "n_clicks"),
+    State("session-id", "data"),
     State("order-parameters-table", "data"),
     State("copper-fraction-slider", "value"),
     State("labour-factor-table", "data"),
     State("copper-price", "value"),
     State("zinc-prices-input", "children"),
 )
+@INSTRUMENTATION.callback("compute_client_prices")
 def compute_client_prices(
-    n_clicks, order_data, copper_fraction, labour_factors, copper_price, zinc_prices
+    n_clicks,
+    session_id,
+    order_data,
+    copper_fraction,
+    labour_factors,
+    copper_price,
+    zinc_prices,
 ):
     if n_clicks == 0:
         return [
             {"output-row-idx": "", "output-client": " ", "output-price": "-"},
             {"output-row-idx": "", "output-client": "TOTAL", "output-price": "-"},
-        ]
-
-    static_data, market_data = extract_market_and_static_data(
-        copper_fraction=copper_fraction,
-        labour_factors=labour_factors,
-        copper_price=copper_price,
-        zinc_prices=zinc_prices,
+        ], None
+
+    result = price_order_book(
+        session_id,
+        order_data,
+        copper_fraction,
+        labour_factors,
+        copper_price,
+        zinc_prices,
     )
-    orderbook = OrderBook(static_data=static_data)
-
-    order_dict = extract_order_parameters(order_data)
-    orderbook.add_orders(order_dict, market_data=market_data)
-    indices, names, prices = orderbook.get_order_prices()
+    indices, names, prices = result.order_prices
 
     data = [
         {"output-row-idx": idx, "output-client": name, "output-price": price}
         for idx, name, price in zip(indices, names, prices)
     ]
 
-    return data
+    sensitivities = {
+        "copper": result.get_sensitivity(METALS.COPPER),
+        "zinc": result.get_sensitivity(METALS.ZINC),
+        "n_steps": PRICE_SHOCK_STEPS,
+    }
+
+    return data, sensitivities
 
 
-# Display price sensitivity
-@callback(
+# Display price sensitivity. The surface only depends on the aggregate sensitivities and the slider ranges,
+# so it is computed in the browser by assets/price_shock.js and slider moves need no server round trip.
+dash_app.clientside_callback(
+    ClientsideFunction(namespace="pricing", function_name="price_shock_figure"),
     Output("price-shock-figure", "figure"),
     Output("price-shock-fig-col", "style"),
     Output("price-shock-slider-vertical", "style"),
-    [
-        Input("run-price-calculation-button", "n_clicks"),
-        Input("zinc-shock-slider", "value"),
-        Input("copper-shock-slider", "value"),
-    ],
-    [
-        State("order-parameters-table", "data"),
-        State("copper-fraction-slider", "value"),
-        State("labour-factor-table", "data"),
-        State("copper-price", "value"),
-        State("zinc-prices-input", "children"),
-    ],
+    Input("book-sensitivities", "data"),
+    Input("zinc-shock-slider", "value"),
+    Input("copper-shock-slider", "value"),
+    State("price-shock-layout", "data"),
 )
-def compute_price_shock(
-    n_clicks,
-    zinc_shock,
-    copper_shock,
-    order_data,
-    copper_fraction,
-    labour_factors,
-    copper_price,
-    zinc_prices,
-):
-    static_data, market_data = extract_market_and_static_data(
-        copper_fraction=copper_fraction,
-        labour_factors=labour_factors,
-        copper_price=copper_price,
-        zinc_prices=zinc_prices,
-    )
-
-    orderbook = OrderBook(static_data=static_data)
-    order_dict = extract_order_parameters(order_data)
-
-    orderbook.add_orders(order_dict, market_data=market_data)
-
-    # Plot price shock effects
-    (
-        zinc_shock_ladder,
-        copper_shock_ladder,
-        price_change,
-    ) = orderbook.get_price_shock_effects(zinc_shock, copper_shock, 250)
-    fig = go.Figure(
-        data=go.Contour(
-            x=copper_shock_ladder,
-            y=zinc_shock_ladder,
-            z=price_change,
-            colorbar=dict(
-                title="Price change ($)",
-            ),
-        ),
-    )
-
-    fig.update_yaxes(
-        title_text="Zinc price change (%)", title_font={"size": 20}, title_standoff=15
-    )
-    fig.update_xaxes(
-        title_text="Copper price change (%)", title_font={"size": 20}, title_standoff=15
-    )
-
-    fig.update_layout(
-        title_text="Client order price sensitivity ($)",
-        title_font={"size": 20},
-        title_x=0.45,
-    )
-    display_style = {"display": "block"} if n_clicks > 0 else {"display": "none"}
-
-    return fig, display_style, display_style
 
 
 for table, button in zip(
@@ -0,0 +1,288 @@
+# External dependencies
+import warnings
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import (
+    METALS,
+    QUALITY,
+    QUALITY_CODES,
+    QUALITIES_BY_CODE,
+)
+from aad_pricing.external_input.MarketData import MarketData
+from aad_pricing.pricing.DirectedAcyclicGraph import (
+    DirectedAcyclicGraph,
+    INPUT_NAMES,
+    compile_output,
+)
+from aad_pricing.pricing.OrderBook import price_shock_surface
+from aad_pricing.pricing.ShardedExecutor import ShardedExecutor
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION
+
+# Zinc qualities by their integer code, used to index the zinc price vector
+ZINC_QUALITIES = QUALITIES_BY_CODE
+# Quality codes of quality members and names
+ZINC_QUALITY_CODES = {
+    **{q.value: code for q, code in QUALITY_CODES.items()},
+    **QUALITY_CODES,
+}
+
+
+class BatchOrderBook(object):
+    """
+    Class BatchOrderBook is a columnar (struct-of-arrays) alternative to OrderBook.
+
+    Orders are held as NumPy columns instead of one ClientOrder and DirectedAcyclicGraph per order.
+    Prices and raw material sensitivities of the whole book come from a single replay of the compiled
+    price graph over the columns. The replay applies the same operations in the same order as the graph,
+    so the results match OrderBook.get_order_prices and ClientOrder.get_sensitivity exactly.
+
+    With a ShardedExecutor the pricing kernel runs on shards of the columns in parallel. Results are merged
+    in row order and the total is accumulated sequentially, so they don't depend on the number of workers.
+    """
+
+    # Order inputs, followed by the inputs resolved from static and market data when orders are added
+    COLUMNS = (
+        "weight",
+        "rod_length",
+        "quality_code",
+        "copper_fraction",
+        "copper_price",
+        "zinc_price",
+        "labour_factor",
+    )
+
+    def __init__(
+        self,
+        static_data: StaticData,
+        executor: ShardedExecutor = None,
+        kernel=None,
+    ) -> None:
+        self._static_data = static_data
+        self._executor = executor
+        self._kernel = kernel or replay_kernel
+        # Order id -> row in the columns
+        self._row_index = {}
+        self._order_ids = []
+        self._client_names = []
+        self._columns = {
+            name: np.empty(0, dtype=np.int8 if name == "quality_code" else float)
+            for name in self.COLUMNS
+        }
+        # Prices and input adjoints of the last replay, reset whenever the columns change
+        self._replay = None
+
+    def __len__(self) -> int:
+        return len(self._order_ids)
+
+    def add_orders(self, orders: dict, market_data: MarketData) -> None:
+        if len(orders) == 0:
+            return
+
+        names, weights, rod_lengths, qualities = zip(*orders.values())
+        self.add_order_columns(
+            list(orders),
+            names,
+            np.asarray(weights, dtype=float),
+            np.asarray(rod_lengths, dtype=float),
+            quality_codes(qualities),
+            market_data,
+        )
+
+    def add_order_columns(
+        self,
+        order_ids: list,
+        client_names,
+        weights: np.ndarray,
+        rod_lengths: np.ndarray,
+        quality_code: np.ndarray,
+        market_data: MarketData,
+    ) -> None:
+        # Bulk insert of orders that are already in columnar form, e.g. read from a file.
+        # Quality codes index ZINC_QUALITIES.
+        new_columns = self._resolve_columns(
+            weights, rod_lengths, quality_code, market_data
+        )
+
+        self._replay = None
+        rows = np.fromiter(
+            (self._row_index.get(k, -1) for k in order_ids),
+            dtype=np.intp,
+            count=len(order_ids),
+        )
+        existing = rows >= 0
+        if existing.any():
+            warnings.warn("Overwriting client order with the same id")
+            # Overwritten orders keep their position in the book, like a dict update
+            for name in self.COLUMNS:
+                self._columns[name][rows[existing]] = new_columns[name][existing]
+            for row, name in zip(
+                rows[existing], np.asarray(client_names, dtype=object)[existing]
+            ):
+                self._client_names[row] = name
+
+        appended = ~existing
+        new_ids = [k for k, is_new in zip(order_ids, appended) if is_new]
+        offset = len(self._order_ids)
+        self._row_index.update({k: offset + i for i, k in enumerate(new_ids)})
+        self._order_ids.extend(new_ids)
+        self._client_names.extend(
+            n for n, is_new in zip(client_names, appended) if is_new
+        )
+        for name in self.COLUMNS:
+            self._columns[name] = np.concatenate(
+                (self._columns[name], new_columns[name][appended])
+            )
+
+    def reprice(self, market_data: MarketData) -> None:
+        # Only the market price columns change, the compiled graph is replayed on the next query
+        self._columns["copper_price"][:] = market_data.get_price(METALS.COPPER)
+        self._columns["zinc_price"] = zinc_price_vector(market_data)[
+            self._columns["quality_code"]
+        ]
+        self._replay = None
+
+    def _resolve_columns(
+        self,
+        weight: np.ndarray,
+        rod_length: np.ndarray,
+        quality_code: np.ndarray,
+        market_data: MarketData,
+    ) -> dict:
+        n_orders = len(weight)
+        return {
+            "weight": weight,
+            "rod_length": rod_length,
+            "quality_code": quality_code,
+            "copper_fraction": np.full(
+                n_orders, self._static_data.get_alloy_mass_fraction(METALS.COPPER)
+            ),
+            "copper_price": np.full(n_orders, market_data.get_price(METALS.COPPER)),
+            "zinc_price": zinc_price_vector(market_data)[quality_code],
+            "labour_factor": self._static_data.get_labour_factors(rod_length),
+        }
+
+    def _replay_graph(self) -> tuple:
+        if self._replay is None:
+            INSTRUMENTATION.count("orders_priced", len(self))
+            cols = self._columns
+            leaf_values = {
+                "total_weight": cols["weight"],
+                "copper_fraction": cols["copper_fraction"],
+                "copper_price": cols["copper_price"],
+                "zinc_price": cols["zinc_price"],
+                "labour_factor": cols["labour_factor"],
+            }
+            with INSTRUMENTATION.timer("batch_replay"):
+                if self._executor is None:
+                    result = self._kernel(leaf_values)
+                else:
+                    result = self._executor.map_shards(self._kernel, leaf_values)
+            prices = result.pop("price")
+            self._replay = prices, result
+        return self._replay
+
+    def get_prices(self) -> np.ndarray:
+        prices, _ = self._replay_graph()
+        return prices
+
+    def get_sensitivities(self, metal: METALS) -> np.ndarray:
+        _, gradient = self._replay_graph()
+        if metal == METALS.COPPER:
+            return gradient["copper_price"] * self._columns["copper_price"]
+        elif metal == METALS.ZINC:
+            return gradient["zinc_price"] * self._columns["zinc_price"]
+        else:
+            raise NotImplementedError("Unknown metal requested.")
+
+    def get_market_sensitivities(self) -> dict:
+        # Columnar counterpart of OrderBook.get_market_sensitivities: the adjoint of a shared market price leaf
+        # is the sum of the order adjoints of that price in the pricing replay
+        if len(self) == 0:
+            return {}
+        codes = self._columns["quality_code"]
+        zinc_sensitivities = np.bincount(
+            codes,
+            weights=self.get_sensitivities(METALS.ZINC),
+            minlength=len(ZINC_QUALITIES),
+        )
+        sensitivities = {
+            (METALS.COPPER, QUALITY.DEFAULT): float(
+                self.get_sensitivities(METALS.COPPER).sum()
+            )
+        }
+        for code in np.unique(codes).tolist():
+            sensitivities[(METALS.ZINC, ZINC_QUALITIES[code])] = float(
+                zinc_sensitivities[code]
+            )
+        return sensitivities
+
+    def get_jacobian(self) -> np.ndarray:
+        # Price derivatives w.r.t. the graph inputs from the pricing replay, one row per order and one
+        # column per input in INPUT_NAMES order
+        _, gradient = self._replay_graph()
+        jacobian = np.empty((len(self), len(INPUT_NAMES)))
+        for column, name in enumerate(INPUT_NAMES):
+            jacobian[:, column] = gradient[name]
+        return jacobian
+
+    # Pass shock list as [low, high] to specify the range of price shocks
+    def get_price_shock_effects(
+        self, zinc_shock_percentages: list, copper_shock_percentages: list, n_steps=100
+    ) -> tuple:
+        return price_shock_surface(
+            self.get_sensitivities(METALS.ZINC).sum(),
+            self.get_sensitivities(METALS.COPPER).sum(),
+            zinc_shock_percentages,
+            copper_shock_percentages,
+            n_steps,
+        )
+
+    def get_order_prices(self) -> tuple:
+        prices = self.get_prices().tolist()
+
+        indices = [idx + 1 for idx in self._order_ids] + [""]
+        names = self._client_names + ["TOTAL"]
+        # Accumulate in order so the total matches OrderBook.get_order_prices exactly
+        total_price = 0.0
+        for price in prices:
+            total_price += price
+
+        return indices, names, prices + [total_price]
+
+
+# Pricing kernels map graph input columns to {"price": prices, input name: adjoints}. They are module level
+# functions so a process pool can pickle them.
+def replay_kernel(leaf_values: dict) -> dict:
+    # Price graph compiled once per process, replayed against the order columns
+    prices, gradient = compile_output("price").replay(leaf_values)
+    return {"price": np.asarray(prices, dtype=float), **gradient}
+
+
+def graph_kernel(leaf_values: dict) -> dict:
+    # One DirectedAcyclicGraph per order, as OrderBook prices them
+    names = INPUT_NAMES
+    n_orders = len(leaf_values[names[0]])
+    result = {name: np.empty(n_orders) for name in ("price", *names)}
+    for row, inputs in enumerate(zip(*(leaf_values[name] for name in names))):
+        graph = DirectedAcyclicGraph(*(float(x) for x in inputs))
+        result["price"][row] = graph.get_price()
+        for name, node in graph.get_input_nodes().items():
+            result[name][row] = node.get_gradient()
+    return result
+
+
+def quality_codes(qualities) -> np.ndarray:
+    # Unknown qualities map to QUALITY.DEFAULT, as QUALITY._missing_ does
+    return np.fromiter(
+        (ZINC_QUALITY_CODES.get(q, 0) for q in qualities),
+        dtype=np.int8,
+        count=len(qualities),
+    )
+
+
+def zinc_price_vector(market_data: MarketData) -> np.ndarray:
+    return np.array(
+        [market_data.get_price(METALS.ZINC, quality=q) for q in ZINC_QUALITIES]
+    )
@@ -0,0 +1,91 @@
+# External dependencies
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.DirectedAcyclicGraph import INPUT_NAMES, compile_output
+from aad_pricing.static.Constants import METALS, QUALITY
+
+
+class BookGraph(object):
+    """
+    Class BookGraph is the graph of the total price of an order book: the order price graph of every order summed
+    into a TOTAL node, with the market prices as shared leaf nodes, one copper price node and one node per zinc
+    quality. Order weights, copper fractions and labour factors are per-order leaves.
+
+    One reverse sweep from the total gives the derivatives of the book price w.r.t. every market price. The sweep
+    replays the compiled order price graph over the order columns in vector mode: the total seeds every order
+    price with an adjoint of 1, and the adjoint of a shared leaf is the sum of the adjoints of the orders that
+    use it.
+    """
+
+    def __init__(self) -> None:
+        # Shared market price leaves: (metal, quality, price) -> leaf index. Orders priced against different
+        # market data objects may see different prices for the same metal and quality.
+        self._leaves = {}
+        # Graph inputs of every order, and the leaf indices of its copper and zinc price
+        self._inputs = []
+        self._copper_leaves = []
+        self._zinc_leaves = []
+        self._sweep = None
+
+    def __len__(self) -> int:
+        return len(self._inputs)
+
+    def _leaf(self, metal: METALS, quality: QUALITY, price: float) -> int:
+        return self._leaves.setdefault((metal, quality, price), len(self._leaves))
+
+    def add_order(self, inputs: tuple, zinc_quality: QUALITY) -> None:
+        # inputs: (total weight, copper fraction, copper price, zinc price, labour factor) of the order graph
+        self._inputs.append(inputs)
+        self._copper_leaves.append(
+            self._leaf(METALS.COPPER, QUALITY.DEFAULT, inputs[2])
+        )
+        self._zinc_leaves.append(self._leaf(METALS.ZINC, zinc_quality, inputs[3]))
+        self._sweep = None
+
+    def _reverse_sweep(self) -> tuple:
+        # Order prices and the adjoints of the shared leaves by leaf index
+        if self._sweep is None:
+            columns = np.array(self._inputs, dtype=float).reshape(-1, len(INPUT_NAMES))
+            prices, gradient = compile_output("price").replay(
+                {name: columns[:, k] for k, name in enumerate(INPUT_NAMES)}
+            )
+            n_leaves = len(self._leaves)
+            adjoints = np.bincount(
+                self._copper_leaves,
+                weights=gradient["copper_price"],
+                minlength=n_leaves,
+            ) + np.bincount(
+                self._zinc_leaves, weights=gradient["zinc_price"], minlength=n_leaves
+            )
+            self._sweep = np.asarray(prices, dtype=float), adjoints
+        return self._sweep
+
+    def get_total_price(self) -> float:
+        prices, _ = self._reverse_sweep()
+        # Accumulate in order so the total matches OrderBook.get_order_prices exactly
+        total_price = 0.0
+        for price in prices.tolist():
+            total_price += price
+        return total_price
+
+    def get_market_gradient(self) -> dict:
+        # d(total price)/d(market price) by (metal, quality)
+        _, adjoints = self._reverse_sweep()
+        gradient = {}
+        for (metal, quality, _), leaf in self._leaves.items():
+            gradient[metal, quality] = gradient.get((metal, quality), 0.0) + float(
+                adjoints[leaf]
+            )
+        return gradient
+
+    def get_market_sensitivities(self) -> dict:
+        # Total price change per relative market price change by (metal, quality), scaled like
+        # DirectedAcyclicGraph.get_price_sensitivity
+        _, adjoints = self._reverse_sweep()
+        sensitivities = {}
+        for (metal, quality, price), leaf in self._leaves.items():
+            sensitivities[metal, quality] = sensitivities.get(
+                (metal, quality), 0.0
+            ) + float(adjoints[leaf] * price)
+        return sensitivities
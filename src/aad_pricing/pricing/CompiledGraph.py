@@ -0,0 +1,94 @@
+from typing import Any, Dict, Tuple
+
+# Internal dependencies
+from aad_pricing.pricing.Tape import ADD, LEAF, MUL, SUB, TapeNode
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION
+
+
+class CompiledGraph(object):
+    """
+    Class CompiledGraph freezes a graph recorded on a Tape so it can be replayed against new leaf values.
+
+    At compile time the entries the output depends on are kept in topological (tape) order, which gives
+    both the forward schedule and, reversed, the fixed adjoint schedule. Replaying creates no node objects.
+    Leaf values can be floats or NumPy arrays of equal shape, in which case one replay prices a whole batch.
+    """
+
+    def __init__(self, output: TapeNode, inputs: Dict[str, TapeNode]) -> None:
+        tape = output._tape
+        self._input_names = tuple(inputs)
+
+        # Entries the output depends on, walking the tape backwards from the output. Inputs are always kept,
+        # inputs the output doesn't depend on get a zero adjoint.
+        reachable = {output._index, *(node._index for node in inputs.values())}
+        for idx in range(output._index, -1, -1):
+            if idx in reachable and tape._op_codes[idx] != LEAF:
+                reachable.update((tape._lhs[idx], tape._rhs[idx]))
+        entries = sorted(reachable)
+        # Compact slot numbering of the kept entries
+        slot = {idx: k for k, idx in enumerate(entries)}
+
+        self._n_slots = len(entries)
+        self._output_slot = slot[output._index]
+        self._input_slots = tuple(
+            slot[inputs[name]._index] for name in self._input_names
+        )
+        self._constants = tuple(
+            (slot[idx], tape._values[idx])
+            for idx in entries
+            if tape._op_codes[idx] == LEAF and slot[idx] not in self._input_slots
+        )
+        # Forward schedule: (slot, op code, lhs slot, rhs slot)
+        self._schedule = tuple(
+            (slot[idx], tape._op_codes[idx], slot[tape._lhs[idx]], slot[tape._rhs[idx]])
+            for idx in entries
+            if tape._op_codes[idx] != LEAF
+        )
+        self._adjoint_schedule = tuple(reversed(self._schedule))
+
+    def get_input_names(self) -> Tuple[str, ...]:
+        return self._input_names
+
+    @INSTRUMENTATION.timed("forward_pass")
+    def forward(self, leaf_values: Dict[str, Any]) -> list:
+        values = [None] * self._n_slots
+        for idx, value in self._constants:
+            values[idx] = value
+        for name, idx in zip(self._input_names, self._input_slots):
+            values[idx] = leaf_values[name]
+
+        for idx, op_code, lhs, rhs in self._schedule:
+            if op_code == MUL:
+                values[idx] = values[lhs] * values[rhs]
+            elif op_code == ADD:
+                values[idx] = values[lhs] + values[rhs]
+            elif op_code == SUB:
+                values[idx] = values[lhs] - values[rhs]
+        return values
+
+    def evaluate(self, leaf_values: Dict[str, Any]) -> Any:
+        return self.forward(leaf_values)[self._output_slot]
+
+    def replay(self, leaf_values: Dict[str, Any], seed: Any = 1.0) -> Tuple[Any, dict]:
+        values = self.forward(leaf_values)
+
+        adjoints = [0.0] * self._n_slots
+        adjoints[self._output_slot] = seed
+        for idx, op_code, lhs, rhs in self._adjoint_schedule:
+            adjoint = adjoints[idx]
+            if op_code == MUL:
+                # Product rule: dz/dlhs = rhs value, dz/drhs = lhs value
+                adjoints[lhs] = adjoints[lhs] + values[rhs] * adjoint
+                adjoints[rhs] = adjoints[rhs] + values[lhs] * adjoint
+            elif op_code == ADD:
+                adjoints[lhs] = adjoints[lhs] + adjoint
+                adjoints[rhs] = adjoints[rhs] + adjoint
+            elif op_code == SUB:
+                adjoints[lhs] = adjoints[lhs] + adjoint
+                adjoints[rhs] = adjoints[rhs] - adjoint
+
+        gradient = {
+            name: adjoints[idx]
+            for name, idx in zip(self._input_names, self._input_slots)
+        }
+        return values[self._output_slot], gradient
@@ -1,4 +1,6 @@
-from typing import Any
+# External dependencies
+from typing import Any, List
+import numpy as np
 
 
 class ComputationalNode:
@@ -6,52 +8,104 @@ class ComputationalNode:
     Class ComputationalNode represents each step of the pricing calculation as a piece of single assignment code.
     It holds both the value and gradients (Jacobian) calculated directly from the pricing calculation in a single pass,
     so we can provide a sensitivity analysis without computing finite differences.
+
+    Values may also be NumPy arrays (vector mode), e.g. one entry per order or per market scenario. The same
+    forward pass and reverse sweep then yield element-wise values and adjoints for all entries at once.
+
+    Nodes only link back to the operands they were computed from. Seeding an output with set_gradient, or
+    backward(output), sweeps the subgraph of the output iteratively along these links, so deep graphs don't
+    hit the recursion limit. backward can be called for several outputs of the same graph in turn.
     """
 
+    # A graph holds many nodes, slots keep each node free of a per-instance __dict__
+    __slots__ = ("_gradient_value", "_value", "_operands")
+
     def __init__(self, value):
         self._gradient_value = None
-        self._value = value
-        self._children_nodes = []
+        self._value = (
+            np.asarray(value, dtype=float)
+            if isinstance(value, (list, tuple))
+            else value
+        )
+        # (lhs weight, lhs, rhs weight, rhs) of the operation that produced this node, empty for inputs.
+        # There are no links from operands to results, so a graph has no reference cycles and is freed by
+        # reference counting.
+        self._operands = ()
 
     def __mul__(self, other) -> Any:
         z = ComputationalNode(self._value * other._value)
         # Apply product rule: dz = x*dy + y*dx
-        # weight = dz/ dself = other.value
-        self._children_nodes.append((other._value, z))
-        # weight = dz/ dother = self.value
-        other._children_nodes.append((self._value, z))
+        # weight = dz/ dself = other.value, weight = dz/ dother = self.value
+        z._operands = (other._value, self, self._value, other)
 
         return z
 
     def __add__(self, other) -> Any:
         z = ComputationalNode(self._value + other._value)
         # dz = dx + dy
-        # weight = dz/ dself = 1
-        self._children_nodes.append((1.0, z))
-        # weight = dz/ dother = 1
-        other._children_nodes.append((1.0, z))
+        # weight = dz/ dself = 1, weight = dz/ dother = 1
+        z._operands = (1.0, self, 1.0, other)
 
         return z
 
     def __sub__(self, other) -> Any:
         z = ComputationalNode(self._value - other._value)
         # dz = dx - dy
-        # weight = dz/ dself = 1
-        self._children_nodes.append((1.0, z))
-        # weight = dz/ dother = -1
-        other._children_nodes.append((-1.0, z))
+        # weight = dz/ dself = 1, weight = dz/ dother = -1
+        z._operands = (1.0, self, -1.0, other)
 
         return z
 
     def get_gradient(self) -> float:
+        # Adjoint of the last sweep. Nodes outside the swept subgraph don't feed into the output, zero in the
+        # shape of the value.
         if self._gradient_value is None:
-            self._gradient_value = sum(
-                weight * val.get_gradient() for weight, val in self._children_nodes
-            )
+            return self._value * 0.0
         return self._gradient_value
 
     def set_gradient(self, gradient: float) -> None:
-        self._gradient_value = gradient
+        # Seed this node as the output and sweep its subgraph
+        backward(self, gradient)
 
     def get_value(self) -> float:
         return self._value
+
+
+def topological_order(output: ComputationalNode) -> List[ComputationalNode]:
+    # Nodes the output depends on, operands before the nodes computed from them. Iterative depth first
+    # search, so deep graphs don't hit the recursion limit.
+    order, visited = [], {id(output)}
+    stack = [(output, iter(output._operands[1::2]))]
+    while stack:
+        node, operands = stack[-1]
+        for operand in operands:
+            if id(operand) not in visited:
+                visited.add(id(operand))
+                stack.append((operand, iter(operand._operands[1::2])))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    return order
+
+
+def backward(output: ComputationalNode, seed: Any = 1.0) -> List[ComputationalNode]:
+    # Reverse sweep from the output: adjoints of its subgraph are reset, the output is seeded and adjoints are
+    # pushed to the operands in reverse topological order. Returns the topological order of the subgraph.
+    order = topological_order(output)
+    for node in order:
+        node._gradient_value = node._value * 0.0
+    output._gradient_value = seed
+    for node in reversed(order):
+        if node._operands:
+            lhs_weight, lhs, rhs_weight, rhs = node._operands
+            adjoint = node._gradient_value
+            lhs._gradient_value = lhs._gradient_value + lhs_weight * adjoint
+            rhs._gradient_value = rhs._gradient_value + rhs_weight * adjoint
+    return order
+
+
+def clear_gradients(output: ComputationalNode) -> None:
+    # Forget the adjoints of the subgraph of the output, e.g. before seeding another output
+    for node in topological_order(output):
+        node._gradient_value = None
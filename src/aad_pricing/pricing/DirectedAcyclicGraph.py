@@ -1,14 +1,61 @@
+# External dependencies
+from functools import lru_cache
+
 # Internal dependencies
-from aad_pricing.pricing.ComputationalNode import ComputationalNode
+from aad_pricing.pricing.ComputationalNode import (
+    ComputationalNode,
+    backward,
+    clear_gradients,
+)
+from aad_pricing.pricing.CompiledGraph import CompiledGraph
+from aad_pricing.pricing.DualNumber import DualNumber, get_tangent
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION
+from aad_pricing.pricing.Tape import Tape, TapeNode
 from aad_pricing.static.Constants import METALS
 
+# Graph inputs in constructor order, the columns of order book Jacobians
+INPUT_NAMES = (
+    "total_weight",
+    "copper_fraction",
+    "copper_price",
+    "zinc_price",
+    "labour_factor",
+)
+
+
+@lru_cache(maxsize=None)
+def compile_output(output: str) -> CompiledGraph:
+    # Compiled graph of an output, recorded once per output
+    return DirectedAcyclicGraph.compile(output)
+
 
 class DirectedAcyclicGraph:
     """
     Class DirectedAcyclicGraph executes the price calculation done the nodes. Each node contains a single assignment code, this graph combines them.
     We calculate gradients for sensitivity analysis in the same pass as the price value.
+
+    The inputs may be NumPy arrays (or lists) of equal length to price a batch of orders or market scenarios
+    with one graph; prices and sensitivities are then returned as arrays.
+
+    With use_tape the operations are recorded on a Tape instead of linked ComputationalNode objects,
+    and gradients come from a single iterative reverse sweep over the tape.
+
+    Besides the price, the material cost and the labour cost (price - material cost) are outputs of the same
+    graph. get_jacobian gives the derivatives of any output w.r.t. all inputs from one reverse sweep.
     """
 
+    __slots__ = (
+        "_total_weight",
+        "_copper_split",
+        "_zinc_split",
+        "_copper_price",
+        "_zinc_price",
+        "_labour_factor",
+        "_material_cost",
+        "_labour_cost",
+        "_graph",
+    )
+
     def __init__(
         self,
         total_weight: float,
@@ -16,30 +63,100 @@ class DirectedAcyclicGraph:
         copper_price: float,
         zinc_price: float,
         labour_factor: float,
+        use_tape: bool = False,
     ):
-        self._total_weight = ComputationalNode(total_weight)
-        self._copper_split = ComputationalNode(copper_fraction)
-        self._zinc_split = ComputationalNode(1.0) - self._copper_split
-        self._copper_price = ComputationalNode(copper_price)
-        self._zinc_price = ComputationalNode(zinc_price)
-        self._labour_factor = ComputationalNode(labour_factor)
+        node = Tape().variable if use_tape else ComputationalNode
+        self._total_weight = node(total_weight)
+        self._copper_split = node(copper_fraction)
+        self._zinc_split = node(1.0) - self._copper_split
+        self._copper_price = node(copper_price)
+        self._zinc_price = node(zinc_price)
+        self._labour_factor = node(labour_factor)
+        self._material_cost = None
+        self._labour_cost = None
         self._graph = None
         self._build_graph()
 
+    # Node values are computed as the nodes are created, so building the graph is the forward pass
+    @INSTRUMENTATION.timed("forward_pass")
     def _build_graph(self) -> ComputationalNode:
-        self._graph = (
-            (
-                self._copper_price * self._copper_split
-                + self._zinc_price * self._zinc_split
+        self._material_cost = (
+            self._copper_price * self._copper_split
+            + self._zinc_price * self._zinc_split
+        ) * self._total_weight
+        self._graph = self._material_cost * self._labour_factor
+        self._graph.set_gradient(1.0)
+
+    @classmethod
+    def compile(cls, output: str = "price") -> CompiledGraph:
+        # Record the topology once, the placeholder leaf values are replaced on every replay
+        graph = cls(1.0, 1.0, 1.0, 1.0, 1.0, use_tape=True)
+        output_nodes = graph.get_output_nodes()
+        if output not in output_nodes:
+            raise KeyError("Unknown graph output: " + str(output))
+        return CompiledGraph(output_nodes[output], graph.get_input_nodes())
+
+    def get_input_nodes(self) -> dict:
+        # Leaf nodes by input name, in constructor order
+        return dict(
+            zip(
+                INPUT_NAMES,
+                (
+                    self._total_weight,
+                    self._copper_split,
+                    self._copper_price,
+                    self._zinc_price,
+                    self._labour_factor,
+                ),
             )
-            * self._total_weight
-            * self._labour_factor
         )
+
+    def get_output_nodes(self) -> dict:
+        # Output nodes by name. The labour cost node is recorded on first use, pricing doesn't need it.
+        if self._labour_cost is None:
+            self._labour_cost = self._graph - self._material_cost
+        return {
+            "price": self._graph,
+            "material_cost": self._material_cost,
+            "labour_cost": self._labour_cost,
+        }
+
+    def get_jacobian(self, output: str = "price") -> dict:
+        # Derivatives of the output w.r.t. every input by input name, from one reverse sweep
+        inputs = self.get_input_nodes()
+        if output == "price":
+            # Adjoints of the pricing sweep, shared with get_price_sensitivity
+            return {name: leaf.get_gradient() for name, leaf in inputs.items()}
+        output_nodes = self.get_output_nodes()
+        if output not in output_nodes:
+            raise KeyError("Unknown graph output: " + str(output))
+        node = output_nodes[output]
+        if isinstance(node, TapeNode):
+            adjoints = node._tape.backward(node._index)
+            return {name: adjoints[leaf._index] for name, leaf in inputs.items()}
+
+        # Inputs outside the subgraph of the output have zero derivatives
+        subgraph = {id(x) for x in backward(node)}
+        jacobian = {
+            name: leaf.get_gradient()
+            if id(leaf) in subgraph
+            else leaf.get_value() * 0.0
+            for name, leaf in inputs.items()
+        }
+        # Back to the price adjoints
+        clear_gradients(node)
         self._graph.set_gradient(1.0)
+        return jacobian
 
     def get_price(self) -> float:
         return self._graph.get_value()
 
+    def get_material_cost(self) -> float:
+        return self._material_cost.get_value()
+
+    def get_labour_cost(self) -> float:
+        return self.get_output_nodes()["labour_cost"].get_value()
+
     def get_price_sensitivity(self, metal: METALS) -> float:
         if metal == METALS.COPPER:
             return self._copper_price.get_gradient() * self._copper_price.get_value()
@@ -47,3 +164,42 @@ class DirectedAcyclicGraph:
             return self._zinc_price.get_gradient() * self._zinc_price.get_value()
         else:
             raise NotImplementedError("Unknown metal requested.")
+
+    def _revalue(self, copper_price, zinc_price):
+        # Same order inputs with new metal prices, which may be arrays or dual numbers
+        return DirectedAcyclicGraph(
+            self._total_weight.get_value(),
+            self._copper_split.get_value(),
+            copper_price,
+            zinc_price,
+            self._labour_factor.get_value(),
+        )
+
+    def get_shocked_price(self, copper_shock, zinc_shock) -> float:
+        # Full revaluation under relative price shocks, arrays of shocks are priced with a single graph
+        return self._revalue(
+            self._copper_price.get_value() * (1.0 + copper_shock),
+            self._zinc_price.get_value() * (1.0 + zinc_shock),
+        ).get_price()
+
+    def get_price_gamma(self, metal_a: METALS, metal_b: METALS) -> float:
+        # Second order sensitivity d2P/(da db) * a * b, scaled like get_price_sensitivity.
+        # Forward-over-reverse: metal prices are dual numbers seeded along metal_a, so the tangent of
+        # the adjoint of metal_b is d(dP/db)/da.
+        prices = {
+            METALS.COPPER: self._copper_price.get_value(),
+            METALS.ZINC: self._zinc_price.get_value(),
+        }
+        if metal_a not in prices or metal_b not in prices:
+            raise NotImplementedError("Unknown metal requested.")
+
+        graph = self._revalue(
+            DualNumber(prices[METALS.COPPER], float(metal_a == METALS.COPPER)),
+            DualNumber(prices[METALS.ZINC], float(metal_a == METALS.ZINC)),
+        )
+        price_node = (
+            graph._copper_price if metal_b == METALS.COPPER else graph._zinc_price
+        )
+        return (
+            get_tangent(price_node.get_gradient()) * prices[metal_a] * prices[metal_b]
+        )
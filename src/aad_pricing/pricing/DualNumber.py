@@ -0,0 +1,56 @@
+from typing import Any
+
+
+class DualNumber(object):
+    """
+    Class DualNumber implements forward mode algorithmic differentiation: a value together with its directional
+    derivative (tangent). Using dual numbers as ComputationalNode values runs the reverse sweep in forward mode
+    too (forward-over-reverse), so each adjoint also carries the derivative of the gradient along the seeded
+    direction, i.e. one row of the Hessian.
+
+    Values and tangents may be floats or NumPy arrays.
+    """
+
+    # Make NumPy defer to the reflected operators below instead of building object arrays
+    __array_ufunc__ = None
+
+    def __init__(self, value: Any, tangent: Any = 0.0) -> None:
+        self.value = value
+        self.tangent = tangent
+
+    def __repr__(self) -> str:
+        return f"DualNumber({self.value!r}, {self.tangent!r})"
+
+    def __add__(self, other) -> Any:
+        if isinstance(other, DualNumber):
+            return DualNumber(self.value + other.value, self.tangent + other.tangent)
+        return DualNumber(self.value + other, self.tangent)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> Any:
+        if isinstance(other, DualNumber):
+            return DualNumber(self.value - other.value, self.tangent - other.tangent)
+        return DualNumber(self.value - other, self.tangent)
+
+    def __rsub__(self, other) -> Any:
+        return DualNumber(other - self.value, -self.tangent)
+
+    def __mul__(self, other) -> Any:
+        if isinstance(other, DualNumber):
+            # Product rule on the tangent
+            return DualNumber(
+                self.value * other.value,
+                self.tangent * other.value + self.value * other.tangent,
+            )
+        return DualNumber(self.value * other, self.tangent * other)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> Any:
+        return DualNumber(-self.value, -self.tangent)
+
+
+def get_tangent(value: Any) -> Any:
+    # Adjoints that don't depend on the seeded direction stay plain numbers, their tangent is zero
+    return value.tangent if isinstance(value, DualNumber) else value * 0.0
@@ -0,0 +1,241 @@
+# External dependencies
+import os
+import pathlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable
+
+# Environment variables that switch instrumentation and callback profiling on at start up
+ENABLE_VARIABLE = "AAD_PRICING_INSTRUMENTATION"
+PROFILER_VARIABLE = "AAD_PRICING_PROFILER"
+PROFILE_DIR_VARIABLE = "AAD_PRICING_PROFILE_DIR"
+# Serve the /metrics endpoint of the app even while instrumentation is off at start up
+METRICS_VARIABLE = "AAD_PRICING_METRICS"
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class Instrumentation(object):
+    """
+    Class Instrumentation collects timers and counters of the pricing hot paths: graph build, forward pass,
+    reverse sweep, shock grid build, Dash callbacks and their responses. It is switched on and off at runtime,
+    and when off an instrumented function costs one flag check.
+
+    Measurements are exported as a report dictionary or in the Prometheus text format. Callbacks can
+    optionally be profiled one call at a time with cProfile or pyinstrument.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        profiler: str = None,
+        profile_dir: str = None,
+        prefix: str = "aad_pricing",
+    ) -> None:
+        self.enabled = enabled
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        # Section name -> [calls, total seconds, max seconds]
+        self._timers = {}
+        # Counter name -> count
+        self._counters = {}
+        self._profiler = None
+        self._profile_dir = None
+        self._n_profiles = 0
+        self.set_profiler(profiler, profile_dir)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def set_profiler(self, profiler: str = None, profile_dir: str = None) -> None:
+        # Profile every instrumented callback with "cprofile" or "pyinstrument", None switches profiling off.
+        # Profiles are written to profile_dir, or printed to stderr without one.
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}, use one of {PROFILERS}")
+        self._profiler = profiler
+        self._profile_dir = profile_dir
+
+    def record(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable:
+        # Decorator timing every call of a function as section name while instrumentation is enabled
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def callback(self, name: str) -> Callable:
+        # Decorator for Dash callbacks: times the callback, and runs it under the profiler when one is set.
+        # Dash serializes the outputs afterwards, their size is measured on the response, see record_response.
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if self._profiler is not None:
+                    with self._profile(name):
+                        return func(*args, **kwargs)
+                elif self.enabled:
+                    with self.timer("callback." + name):
+                        return func(*args, **kwargs)
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record_response(self, name: str, seconds: float, n_bytes: int) -> None:
+        # Time and body size of a served response, e.g. a Dash callback including the serialization of
+        # its outputs by Dash
+        if not self.enabled:
+            return
+        self.record("response." + name, seconds)
+        self.count("response_bytes." + name, n_bytes)
+
+    @contextmanager
+    def _profile(self, name: str):
+        with self._lock:
+            self._n_profiles += 1
+            path = None
+            if self._profile_dir is not None:
+                path = pathlib.Path(self._profile_dir) / f"{name}-{self._n_profiles}"
+
+        if self._profiler == "pyinstrument":
+            profiler = import_pyinstrument().Profiler()
+            profiler.start()
+            try:
+                with self.timer("callback." + name):
+                    yield
+            finally:
+                profiler.stop()
+                if path is None:
+                    print(profiler.output_text(), file=sys.stderr)
+                else:
+                    path.with_suffix(".html").write_text(profiler.output_html())
+        else:
+            import cProfile
+            import pstats
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                with self.timer("callback." + name):
+                    yield
+            finally:
+                profiler.disable()
+                if path is None:
+                    stats = pstats.Stats(profiler, stream=sys.stderr)
+                    stats.sort_stats("cumulative").print_stats(20)
+                else:
+                    profiler.dump_stats(path.with_suffix(".prof"))
+
+    def report(self) -> dict:
+        # {"timers": {name: {calls, total_seconds, mean_seconds, max_seconds}}, "counters": {name: count}}
+        with self._lock:
+            timers = {
+                name: {
+                    "calls": calls,
+                    "total_seconds": total,
+                    "mean_seconds": total / calls,
+                    "max_seconds": maximum,
+                }
+                for name, (calls, total, maximum) in sorted(self._timers.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+        return {"enabled": self.enabled, "timers": timers, "counters": counters}
+
+    def prometheus_text(self) -> str:
+        # Prometheus text exposition format, sections and counters are labels of a few metric families
+        report = self.report()
+        seconds, counter = self._prefix + "_section_seconds", self._prefix + "_events"
+        lines = [
+            f"# HELP {seconds} Time spent in instrumented sections.",
+            f"# TYPE {seconds} summary",
+        ]
+        for name, timer in report["timers"].items():
+            label = prometheus_label("section", name)
+            lines.append(f"{seconds}_sum{label} {timer['total_seconds']!r}")
+            lines.append(f"{seconds}_count{label} {timer['calls']}")
+        lines += [
+            f"# HELP {seconds}_max Longest call of instrumented sections.",
+            f"# TYPE {seconds}_max gauge",
+        ]
+        for name, timer in report["timers"].items():
+            label = prometheus_label("section", name)
+            lines.append(f"{seconds}_max{label} {timer['max_seconds']!r}")
+        lines += [
+            f"# HELP {counter}_total Instrumented event counts.",
+            f"# TYPE {counter}_total counter",
+        ]
+        for name, count in report["counters"].items():
+            lines.append(f"{counter}_total{prometheus_label('event', name)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def prometheus_label(key: str, value: str) -> str:
+    value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'{{{key}="{value}"}}'
+
+
+def import_pyinstrument():
+    # Optional profiler, imported on first use
+    try:
+        import pyinstrument
+    except ImportError as error:
+        raise ImportError(
+            "Profiling with pyinstrument requires `pip install pyinstrument`"
+        ) from error
+    return pyinstrument
+
+
+# Instrumentation of the pricing library, off unless switched on at runtime or with AAD_PRICING_INSTRUMENTATION=1
+INSTRUMENTATION = Instrumentation(
+    enabled=os.environ.get(ENABLE_VARIABLE, "") not in ("", "0"),
+    profiler=os.environ.get(PROFILER_VARIABLE) or None,
+    profile_dir=os.environ.get(PROFILE_DIR_VARIABLE) or None,
+)
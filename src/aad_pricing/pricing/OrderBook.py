@@ -1,38 +1,261 @@
 # External dependencies
 import warnings
-import itertools
+import weakref
 import numpy as np
 
 # Internal dependencies
 from aad_pricing.external_input.ClientOrder import ClientOrder
-from aad_pricing.static.StaticData import StaticData
+from aad_pricing.pricing.BookGraph import BookGraph
+from aad_pricing.pricing.DirectedAcyclicGraph import INPUT_NAMES
+from aad_pricing.static.StaticData import StaticData, changed_labour_bands
 from aad_pricing.external_input.MarketData import MarketData
-from aad_pricing.static.Constants import METALS
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.static.Observable import Observable
+from aad_pricing.pricing.PricingCache import PricingCache
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION
 
 
-class OrderBook(object):
+class OrderBook(Observable):
     """
     Class OrderBook is a container class for client orders.
 
     Client order input data is collected here. This class provides the price calculations
     and price sensitivities with respect to raw material price shocks.
+
+    Orders can be added, updated and removed one at a time. The total price and the aggregate sensitivities
+    are maintained incrementally: only orders that changed since the last query are subtracted and re-added,
+    and when static or market data change only orders whose graph inputs are affected are repriced.
+
+    An inverted index from market prices (metal, quality) and labour factor bands to the dependent orders
+    is kept up to date, so a MarketData.set_price, StaticData.set_copper_fraction or StaticData.set_labour_factors
+    call reprices the affected orders only. Listeners of the order book are notified with the set of changed order ids.
+
+    An optional PricingCache, which may be shared between books, memoizes prices and sensitivities of orders
+    with the same parameters under the same static and market data.
+
+    With compact_orders, each order keeps only its price and sensitivities instead of its pricing graph,
+    which cuts the memory of large books several times over.
     """
 
-    def __init__(self, static_data: StaticData) -> None:
+    def __init__(
+        self,
+        static_data: StaticData,
+        pricing_cache: PricingCache = None,
+        compact_orders: bool = False,
+    ) -> None:
+        super().__init__()
         self._static_data = static_data
+        self._pricing_cache = pricing_cache
+        self._compact_orders = compact_orders
+        self._market_data = None
+        # Static and market data objects this book listens to
+        self._observed_data = weakref.WeakSet()
+        self._observe(static_data, self._on_static_data_update)
         self._client_orders = {}
+        # Running totals: price, copper sensitivity and zinc sensitivity
+        self._totals = [0.0, 0.0, 0.0]
+        # Contribution of each order that is included in the running totals
+        self._contributions = {}
+        # Orders whose contribution to the running totals is out of date
+        self._dirty = set()
+        # Market sensitivities of the last book graph sweep, None once an order changed
+        self._market_sensitivities = None
+        # Inverted dependency index: (metal, quality) -> order ids, labour band -> order ids
+        self._orders_by_price = {}
+        self._orders_by_band = {}
+        # Index keys of each order: ((metal, quality) keys, labour band)
+        self._order_keys = {}
+
+    def _mark_dirty(self, order_ids) -> None:
+        self._dirty.update(order_ids)
+        self._market_sensitivities = None
+
+    def _observe(self, data, listener) -> None:
+        if data not in self._observed_data:
+            data.add_listener(listener)
+            self._observed_data.add(data)
+
+    def _unobserve(self, data, listener) -> None:
+        if data in self._observed_data:
+            data.remove_listener(listener)
+            self._observed_data.discard(data)
 
     def add_orders(self, orders: dict, market_data: MarketData) -> None:
         if any(key in self._client_orders for key, val in orders.items()):
             warnings.warn("Overwriting client order with the same id")
+        INSTRUMENTATION.count("orders_priced", len(orders))
         client_order_objs = {
             k: ClientOrder(
-                order[0], order[1], order[2], order[3], self._static_data, market_data
+                order[0],
+                order[1],
+                order[2],
+                order[3],
+                self._static_data,
+                market_data,
+                self._pricing_cache,
+                self._compact_orders,
             )
             for k, order in orders.items()
         }
 
+        self._observe(market_data, self._on_market_data_update)
+        self._market_data = market_data
         self._client_orders.update(client_order_objs)
+        self._mark_dirty(client_order_objs)
+        for order_id in client_order_objs:
+            self._index_order(order_id)
+
+    def add_order(self, order_id, order: list, market_data: MarketData = None) -> None:
+        if market_data is None:
+            market_data = self._market_data
+        if market_data is None:
+            raise ValueError("No market data available to price the order")
+        self.add_orders({order_id: order}, market_data)
+
+    def update_order(self, order_id, order: list) -> None:
+        if order_id not in self._client_orders:
+            raise KeyError("Unknown client order id: " + str(order_id))
+        market_data = self._client_orders[order_id]._market_data
+        self._client_orders[order_id] = ClientOrder(
+            order[0],
+            order[1],
+            order[2],
+            order[3],
+            self._static_data,
+            market_data,
+            self._pricing_cache,
+            self._compact_orders,
+        )
+        self._mark_dirty((order_id,))
+        self._index_order(order_id)
+
+    def remove_order(self, order_id) -> None:
+        del self._client_orders[order_id]
+        self._mark_dirty((order_id,))
+        self._unindex_order(order_id)
+
+    def _index_order(self, order_id) -> None:
+        self._unindex_order(order_id)
+        order = self._client_orders[order_id]
+        price_keys = (
+            (METALS.COPPER, QUALITY.DEFAULT),
+            (METALS.ZINC, order.get_zinc_quality()),
+        )
+        band = self._static_data.get_labour_band(order.get_rod_length())
+
+        for key in price_keys:
+            self._orders_by_price.setdefault(key, set()).add(order_id)
+        self._orders_by_band.setdefault(band, set()).add(order_id)
+        self._order_keys[order_id] = (price_keys, band)
+
+    def _unindex_order(self, order_id) -> None:
+        keys = self._order_keys.pop(order_id, None)
+        if keys is None:
+            return
+        price_keys, band = keys
+        for key in price_keys:
+            self._orders_by_price[key].discard(order_id)
+        self._orders_by_band[band].discard(order_id)
+
+    def get_dependent_orders(self, metal: METALS, quality: QUALITY) -> set:
+        return set(self._orders_by_price.get((metal, QUALITY.from_value(quality)), ()))
+
+    def _on_market_data_update(self, metal: METALS, quality: QUALITY) -> None:
+        self._reprice_orders(self.get_dependent_orders(metal, quality))
+
+    def _on_static_data_update(self, attribute: str, previous) -> None:
+        if attribute == "labour_factors":
+            bands = changed_labour_bands(
+                previous, self._static_data.get_labour_factor_table()
+            )
+            affected = set().union(
+                *(self._orders_by_band.get(band, ()) for band in bands)
+            )
+        else:
+            # The alloy composition applies to every order
+            affected = set(self._client_orders)
+        self._reprice_orders(affected, reindex=True)
+
+    def _reprice_orders(self, order_ids, reindex: bool = False) -> set:
+        changed = {k for k in order_ids if self._client_orders[k].reprice()}
+        INSTRUMENTATION.count("orders_repriced", len(changed))
+        if reindex:
+            # Labour bands may have moved, keep the index in line
+            for order_id in order_ids:
+                self._index_order(order_id)
+        self._mark_dirty(changed)
+        if changed:
+            self._notify_listeners(changed)
+        return changed
+
+    def reprice(
+        self, static_data: StaticData = None, market_data: MarketData = None
+    ) -> set:
+        # Re-resolve every order against the (updated) static and market data and rebuild the graphs
+        # of affected orders only. Returns the ids of the repriced orders.
+        if static_data is not None:
+            if static_data is not self._static_data:
+                self._unobserve(self._static_data, self._on_static_data_update)
+            self._static_data = static_data
+            self._observe(static_data, self._on_static_data_update)
+        if market_data is not None:
+            # Every order is re-resolved against market_data, updates of earlier market data no longer
+            # affect the book
+            for data in list(self._observed_data):
+                if isinstance(data, MarketData) and data is not market_data:
+                    self._unobserve(data, self._on_market_data_update)
+            self._market_data = market_data
+            self._observe(market_data, self._on_market_data_update)
+
+        repriced = {
+            k
+            for k, order in self._client_orders.items()
+            if order.reprice(static_data, market_data)
+        }
+        for order_id in self._client_orders:
+            self._index_order(order_id)
+        INSTRUMENTATION.count("orders_repriced", len(repriced))
+        self._mark_dirty(repriced)
+        if repriced:
+            self._notify_listeners(repriced)
+        return repriced
+
+    def _update_totals(self) -> None:
+        for order_id in self._dirty:
+            old = self._contributions.pop(order_id, None)
+            if old is not None:
+                for k, value in enumerate(old):
+                    self._totals[k] -= value
+            order = self._client_orders.get(order_id)
+            if order is not None:
+                new = tuple(order.get_pricing_result())
+                for k, value in enumerate(new):
+                    self._totals[k] += value
+                self._contributions[order_id] = new
+        self._dirty.clear()
+
+    def get_total_price(self) -> float:
+        self._update_totals()
+        return self._totals[0]
+
+    def get_total_sensitivity(self, metal: METALS) -> float:
+        self._update_totals()
+        if metal == METALS.COPPER:
+            return self._totals[1]
+        elif metal == METALS.ZINC:
+            return self._totals[2]
+        else:
+            raise NotImplementedError("Unknown metal requested.")
+
+    def get_market_sensitivities(self) -> dict:
+        # Sensitivities of the total price to every market price by (metal, quality), from one reverse sweep
+        # over a book-level graph with shared market price leaves. The sweep is kept until an order changes.
+        if self._market_sensitivities is None:
+            book_graph = BookGraph()
+            for order in self._client_orders.values():
+                book_graph.add_order(order.get_graph_inputs(), order.get_zinc_quality())
+            self._market_sensitivities = book_graph.get_market_sensitivities()
+        return dict(self._market_sensitivities)
 
     def get_order_prices(self) -> dict:
         total_price = 0.0
@@ -51,41 +274,116 @@ class OrderBook(object):
 
         return indices, names, prices
 
-    # Pass shock list as [low, high] to specify the range of price shocks
+    def get_jacobian(self) -> np.ndarray:
+        # Price derivatives of every order w.r.t. its graph inputs, one row per order as in get_order_prices
+        # and one column per input in INPUT_NAMES order
+        jacobian = np.empty((len(self._client_orders), len(INPUT_NAMES)))
+        for row, order in enumerate(self._client_orders.values()):
+            order_jacobian = order.get_jacobian()
+            jacobian[row] = [order_jacobian[name] for name in INPUT_NAMES]
+        return jacobian
+
+    # Pass shock list as [low, high] to specify the range of price shocks.
+    # Methods: "first_order" (sensitivities), "second_order" (sensitivities and gammas), "aggregate" (sensitivities
+    # from one sweep over a book-level graph, see get_market_sensitivities), or "full_revaluation" which reprices
+    # every order on the whole shock grid with one vector-mode graph per order.
     def get_price_shock_effects(
-        self, zinc_shock_percentages: list, copper_shock_percentages: list, n_steps=100
-    ) -> dict:
-        zinc_shock_ladder = (
-            np.linspace(
-                zinc_shock_percentages[0] / 100.0,
-                zinc_shock_percentages[1] / 100.0,
-                n_steps,
+        self,
+        zinc_shock_percentages: list,
+        copper_shock_percentages: list,
+        n_steps=100,
+        method: str = "first_order",
+    ) -> tuple:
+        if method == "full_revaluation":
+            return self._revalue_price_shocks(
+                zinc_shock_percentages, copper_shock_percentages, n_steps
             )
-        ).tolist()
-        copper_shock_ladder = (
-            np.linspace(
-                copper_shock_percentages[0] / 100.0,
-                copper_shock_percentages[1] / 100.0,
+        elif method == "aggregate":
+            sensitivities = self.get_market_sensitivities()
+            return price_shock_surface(
+                sum(s for (m, _), s in sensitivities.items() if m == METALS.ZINC),
+                sum(s for (m, _), s in sensitivities.items() if m == METALS.COPPER),
+                zinc_shock_percentages,
+                copper_shock_percentages,
                 n_steps,
             )
-        ).tolist()
+        elif method not in ("first_order", "second_order"):
+            raise ValueError("Unknown price shock method: " + str(method))
+
+        # The price change is a polynomial in the shocks, so aggregate the coefficients over the book first
+        zinc_sensitivity = self.get_total_sensitivity(METALS.ZINC)
+        copper_sensitivity = self.get_total_sensitivity(METALS.COPPER)
 
-        shock_pairs = list(itertools.product(zinc_shock_ladder, copper_shock_ladder))
-        price_change = np.zeros_like(shock_pairs)
+        gammas = None
+        if method == "second_order":
+            gammas = [0.0, 0.0, 0.0]
+            for order in self._client_orders.values():
+                gammas[0] += order.get_gamma(METALS.ZINC, METALS.ZINC)
+                gammas[1] += order.get_gamma(METALS.ZINC, METALS.COPPER)
+                gammas[2] += order.get_gamma(METALS.COPPER, METALS.COPPER)
 
-        for k, order in self._client_orders.items():
-            sensitivities = (
-                order.get_sensitivity(METALS.ZINC),
-                order.get_sensitivity(METALS.COPPER),
+        return price_shock_surface(
+            zinc_sensitivity,
+            copper_sensitivity,
+            zinc_shock_percentages,
+            copper_shock_percentages,
+            n_steps,
+            gammas=gammas,
+        )
+
+    def _revalue_price_shocks(
+        self, zinc_shock_percentages: list, copper_shock_percentages: list, n_steps
+    ) -> tuple:
+        zinc_shock_ladder = np.linspace(
+            zinc_shock_percentages[0], zinc_shock_percentages[1], n_steps
+        )
+        copper_shock_ladder = np.linspace(
+            copper_shock_percentages[0], copper_shock_percentages[1], n_steps
+        )
+        # Broadcast to a [zinc step, copper step] grid
+        zinc_shocks = zinc_shock_ladder[:, np.newaxis] / 100.0
+        copper_shocks = copper_shock_ladder[np.newaxis, :] / 100.0
+
+        total_price_change = np.zeros((n_steps, n_steps))
+        for order in self._client_orders.values():
+            total_price_change += (
+                order.get_shocked_price(copper_shocks, zinc_shocks) - order.get_price()
             )
-            sensitivity_vector = np.full_like(shock_pairs, sensitivities)
-            price_change += np.multiply(sensitivity_vector, shock_pairs)
 
-        # Convert price differences to percentages because Dash doesn't support percentage formatting on RangeSlider
-        diff_zn_price, diff_cu_price = [pair[0] * 100.0 for pair in shock_pairs], [
-            pair[1] * 100.0 for pair in shock_pairs
-        ]
-        # Sum up price difference in the zinc and copper
-        total_price_change = np.add.reduce(price_change, 1)
+        return zinc_shock_ladder, copper_shock_ladder, total_price_change
+
+
+@INSTRUMENTATION.timed("shock_grid_build")
+def price_shock_surface(
+    zinc_sensitivity: float,
+    copper_sensitivity: float,
+    zinc_shock_percentages: list,
+    copper_shock_percentages: list,
+    n_steps: int,
+    gammas: list = None,
+) -> tuple:
+    # Total price change for every combination of relative zinc and copper price shocks.
+    # Ladders are kept in percentages because Dash doesn't support percentage formatting on RangeSlider,
+    # the price change grid is indexed as [zinc step, copper step].
+    # Optional gammas (zinc-zinc, zinc-copper, copper-copper) add the second order Taylor terms.
+    zinc_shock_ladder = np.linspace(
+        zinc_shock_percentages[0], zinc_shock_percentages[1], n_steps
+    )
+    copper_shock_ladder = np.linspace(
+        copper_shock_percentages[0], copper_shock_percentages[1], n_steps
+    )
+    zinc_shocks = zinc_shock_ladder / 100.0
+    copper_shocks = copper_shock_ladder / 100.0
+    total_price_change = np.add.outer(
+        zinc_sensitivity * zinc_shocks, copper_sensitivity * copper_shocks
+    )
+    if gammas is not None:
+        zinc_gamma, cross_gamma, copper_gamma = gammas
+        total_price_change += np.add.outer(
+            0.5 * zinc_gamma * zinc_shocks**2, 0.5 * copper_gamma * copper_shocks**2
+        )
+        total_price_change += cross_gamma * np.multiply.outer(
+            zinc_shocks, copper_shocks
+        )
 
-        return diff_zn_price, diff_cu_price, total_price_change
+    return zinc_shock_ladder, copper_shock_ladder, total_price_change
@@ -0,0 +1,113 @@
+# External dependencies
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple
+
+# Internal dependencies
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.pricing.DirectedAcyclicGraph import DirectedAcyclicGraph
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION
+
+
+class PricingResult(NamedTuple):
+    price: float
+    copper_sensitivity: float
+    zinc_sensitivity: float
+
+    def get_sensitivity(self, metal: METALS) -> float:
+        if metal == METALS.COPPER:
+            return self.copper_sensitivity
+        elif metal == METALS.ZINC:
+            return self.zinc_sensitivity
+        else:
+            raise NotImplementedError("Unknown metal requested.")
+
+
+# Reads the price and runs the reverse sweep for both metal price adjoints
+@INSTRUMENTATION.timed("reverse_sweep")
+def price_graph(graph: DirectedAcyclicGraph) -> PricingResult:
+    return PricingResult(
+        graph.get_price(),
+        graph.get_price_sensitivity(METALS.COPPER),
+        graph.get_price_sensitivity(METALS.ZINC),
+    )
+
+
+def pricing_key(
+    weight: float, rod_length: float, zinc_quality, static_data, market_data
+) -> tuple:
+    # Live StaticData and MarketData objects keep their snapshot until the next update, so this is cheap
+    return (
+        weight,
+        rod_length,
+        QUALITY.from_value(zinc_quality),
+        static_data.snapshot().content_hash,
+        market_data.snapshot().content_hash,
+    )
+
+
+class PricingCache(object):
+    """
+    Class PricingCache is a size-bounded, least recently used cache of order prices and sensitivities.
+
+    Results are keyed by the order parameters and the content hashes of the static and market data snapshots,
+    so orders with the same weight, rod length and zinc quality share one price calculation. Hits, misses
+    and evictions are counted to tune the capacity against memory use. The cache can be shared between threads.
+    """
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        if capacity < 1:
+            raise ValueError("Cache capacity must be a positive integer")
+        self._capacity = capacity
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: Hashable) -> PricingResult:
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._results.move_to_end(key)
+            return result
+
+    def put(self, key: Hashable, result: PricingResult) -> None:
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self._capacity:
+                self._results.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_price(
+        self, key: Hashable, price_func: Callable[[], PricingResult]
+    ) -> PricingResult:
+        # The price is calculated outside the lock, concurrent misses on one key may both calculate it
+        result = self.get(key)
+        if result is None:
+            result = price_func()
+            self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def get_statistics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._results),
+                "capacity": self._capacity,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,75 @@
+# External dependencies
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple
+
+# Internal dependencies
+from aad_pricing.static.Constants import METALS
+
+
+class BookResult(NamedTuple):
+    # Output of OrderBook.get_order_prices: (indices, names, prices)
+    order_prices: tuple
+    copper_sensitivity: float
+    zinc_sensitivity: float
+
+    def get_sensitivity(self, metal: METALS) -> float:
+        if metal == METALS.COPPER:
+            return self.copper_sensitivity
+        elif metal == METALS.ZINC:
+            return self.zinc_sensitivity
+        else:
+            raise NotImplementedError("Unknown metal requested.")
+
+
+def input_hash(orders: dict, static_data, market_data) -> str:
+    # Stable hash of the order book inputs: order parameters and the static and market data snapshots
+    payload = repr(
+        (
+            sorted(orders.items()),
+            static_data.snapshot().content_hash,
+            market_data.snapshot().content_hash,
+        )
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultStore(object):
+    """
+    Class ResultStore keeps the pricing results of recent order books on the server, per session and keyed by
+    a hash of the inputs, so a book is only priced once per input change.
+
+    Both the number of sessions and the number of results per session are bounded, the least recently used
+    entries are dropped first. The store is local to the server process: callers price the book again on a miss.
+    """
+
+    def __init__(self, max_sessions: int = 1000, results_per_session: int = 4) -> None:
+        self._max_sessions = max_sessions
+        self._results_per_session = results_per_session
+        # Session id -> {input hash -> result}, both in least recently used order
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: Hashable, key: str):
+        with self._lock:
+            results = self._sessions.get(session_id)
+            if results is None or key not in results:
+                return None
+            self._sessions.move_to_end(session_id)
+            results.move_to_end(key)
+            return results[key]
+
+    def put(self, session_id: Hashable, key: str, result) -> None:
+        with self._lock:
+            results = self._sessions.setdefault(session_id, OrderedDict())
+            self._sessions.move_to_end(session_id)
+            results[key] = result
+            results.move_to_end(key)
+            if len(results) > self._results_per_session:
+                results.popitem(last=False)
+            if len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
@@ -0,0 +1,79 @@
+# External dependencies
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict
+import numpy as np
+
+BACKENDS = ("serial", "thread", "process")
+
+
+class ShardedExecutor(object):
+    """
+    Class ShardedExecutor splits columnar order data into shards of at most chunk_size rows and runs a pricing
+    kernel over the shards on a pool of workers.
+
+    Use the process backend for kernels that spend their time in Python (e.g. one graph per order) and the
+    thread backend for NumPy kernels, which release the GIL. Shard results are merged in shard order, so the
+    output doesn't depend on the number of workers or on which worker finishes first.
+    """
+
+    def __init__(
+        self, workers: int = None, chunk_size: int = 100_000, backend: str = "thread"
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError("Unknown executor backend: " + str(backend))
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be a positive integer")
+        self._workers = workers or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._backend = backend
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            pool_type = (
+                ProcessPoolExecutor
+                if self._backend == "process"
+                else ThreadPoolExecutor
+            )
+            self._pool = pool_type(max_workers=self._workers)
+        return self._pool
+
+    def map_shards(
+        self,
+        kernel: Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]],
+        columns: Dict[str, np.ndarray],
+    ) -> Dict[str, np.ndarray]:
+        n_rows = len(next(iter(columns.values()))) if columns else 0
+        bounds = range(0, n_rows, self._chunk_size)
+        shards = [
+            {
+                name: column[start : start + self._chunk_size]
+                for name, column in columns.items()
+            }
+            for start in bounds
+        ]
+
+        if self._backend == "serial" or len(shards) <= 1:
+            results = [kernel(shard) for shard in shards]
+        else:
+            # Executor.map returns results in submission order
+            results = list(self._get_pool().map(kernel, shards))
+
+        if len(results) == 0:
+            return kernel({name: column[:0] for name, column in columns.items()})
+        return {
+            name: np.concatenate([np.atleast_1d(result[name]) for result in results])
+            for name in results[0]
+        }
@@ -0,0 +1,123 @@
+from typing import Any, List
+
+# Operation codes recorded on the tape
+LEAF, ADD, SUB, MUL = 0, 1, 2, 3
+# Operand index used for the missing operands of leaf entries
+NO_OPERAND = -1
+
+
+class Tape(object):
+    """
+    Class Tape is a Wengert list for reverse mode algorithmic differentiation.
+
+    Every operation is recorded as one entry in flat, parallel arrays: its op code, the indices of its two
+    operands and the partial derivatives of the result with respect to those operands. Because entries are appended
+    in evaluation order the tape is already topologically sorted, so all adjoints are accumulated in a single
+    iterative reverse sweep, without recursion and without per-node objects holding child lists.
+    """
+
+    def __init__(self) -> None:
+        self._op_codes: List[int] = []
+        self._values: List[float] = []
+        # Operand indices and partial derivatives of each entry w.r.t. its left and right operand
+        self._lhs: List[int] = []
+        self._rhs: List[int] = []
+        self._lhs_partials: List[float] = []
+        self._rhs_partials: List[float] = []
+        # Output node and seed set through TapeNode.set_gradient
+        self._seed_index = None
+        self._seed = None
+        self._adjoints = None
+
+    def __len__(self) -> int:
+        return len(self._op_codes)
+
+    def variable(self, value: float) -> Any:
+        return self._record(LEAF, NO_OPERAND, NO_OPERAND, value, 0.0, 0.0)
+
+    def _record(
+        self,
+        op_code: int,
+        lhs: int,
+        rhs: int,
+        value: float,
+        lhs_partial: float,
+        rhs_partial: float,
+    ) -> Any:
+        self._op_codes.append(op_code)
+        self._values.append(value)
+        self._lhs.append(lhs)
+        self._rhs.append(rhs)
+        self._lhs_partials.append(lhs_partial)
+        self._rhs_partials.append(rhs_partial)
+        # Recording invalidates a previous sweep
+        self._adjoints = None
+        return TapeNode(self, len(self._op_codes) - 1)
+
+    def seed(self, index: int, gradient: float) -> None:
+        self._seed_index = index
+        self._seed = gradient
+        self._adjoints = None
+
+    def backward(self, output_index: int, seed: float = 1.0) -> List[float]:
+        # Adjoints of every entry w.r.t. the output entry, the seeded output of the tape is left as it is
+        lhs_operands, rhs_operands = self._lhs, self._rhs
+        lhs_partials, rhs_partials = self._lhs_partials, self._rhs_partials
+        adjoints = [0.0] * len(self._op_codes)
+        adjoints[output_index] = seed
+
+        # Entries recorded after the output can't contribute to it
+        for idx in range(output_index, -1, -1):
+            adjoint = adjoints[idx]
+            if adjoint == 0.0:
+                continue
+            lhs = lhs_operands[idx]
+            if lhs != NO_OPERAND:
+                adjoints[lhs] += lhs_partials[idx] * adjoint
+                adjoints[rhs_operands[idx]] += rhs_partials[idx] * adjoint
+        return adjoints
+
+    def get_adjoint(self, index: int) -> float:
+        if self._adjoints is None:
+            if self._seed_index is None:
+                raise RuntimeError("Seed an output node with set_gradient first")
+            self._adjoints = self.backward(self._seed_index, self._seed)
+        return self._adjoints[index]
+
+
+class TapeNode(object):
+    """
+    Class TapeNode is a lightweight handle to an entry on a Tape. It exposes the same interface as
+    ComputationalNode, so pricing graphs can be recorded on a tape without changing the formulas.
+    """
+
+    __slots__ = ("_tape", "_index")
+
+    def __init__(self, tape: Tape, index: int) -> None:
+        self._tape = tape
+        self._index = index
+
+    def __mul__(self, other) -> Any:
+        values = self._tape._values
+        x, y = values[self._index], values[other._index]
+        # Product rule: dz/dself = other.value, dz/dother = self.value
+        return self._tape._record(MUL, self._index, other._index, x * y, y, x)
+
+    def __add__(self, other) -> Any:
+        values = self._tape._values
+        x, y = values[self._index], values[other._index]
+        return self._tape._record(ADD, self._index, other._index, x + y, 1.0, 1.0)
+
+    def __sub__(self, other) -> Any:
+        values = self._tape._values
+        x, y = values[self._index], values[other._index]
+        return self._tape._record(SUB, self._index, other._index, x - y, 1.0, -1.0)
+
+    def get_gradient(self) -> float:
+        return self._tape.get_adjoint(self._index)
+
+    def set_gradient(self, gradient: float) -> None:
+        self._tape.seed(self._index, gradient)
+
+    def get_value(self) -> float:
+        return self._tape._values[self._index]
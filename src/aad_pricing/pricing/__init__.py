@@ -1 +1,24 @@
-__all__ = ["OrderBook", "ComputationalNode", "DirectedAcyclicGraph"]
+# External dependencies
+import importlib
+
+__all__ = [
+    "OrderBook",
+    "BatchOrderBook",
+    "BookGraph",
+    "ComputationalNode",
+    "CompiledGraph",
+    "DirectedAcyclicGraph",
+    "DualNumber",
+    "Instrumentation",
+    "PricingCache",
+    "ResultStore",
+    "ShardedExecutor",
+    "Tape",
+]
+
+
+def __getattr__(name: str):
+    # Modules are imported on first access, importing the package itself stays cheap
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
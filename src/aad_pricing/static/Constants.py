@@ -3,11 +3,14 @@ from typing import Any, List
 
 
 class EnumWithMetaValue(EnumMeta):
-    def __getattribute__(cls, __name: str) -> Any:
-        value = super().__getattribute__(__name)
-        if isinstance(value, cls):
-            value = value.value
-        return value
+    # Members read as their values, e.g. METALS.COPPER == "Copper". The values are stored as plain class
+    # attributes when the enum is created, so member access is an ordinary class attribute lookup instead of
+    # a hook on every attribute of the class.
+    def __new__(metacls, cls, bases, classdict, **kwds):
+        enum_class = super().__new__(metacls, cls, bases, classdict, **kwds)
+        for name, member in enum_class._member_map_.items():
+            type.__setattr__(enum_class, name, member._value_)
+        return enum_class
 
 
 class METALS(Enum, metaclass=EnumWithMetaValue):
@@ -16,12 +19,12 @@ class METALS(Enum, metaclass=EnumWithMetaValue):
 
     @staticmethod
     def from_string(name: str) -> Any:
-        if name.lower() == METALS.COPPER.lower():
-            return METALS.COPPER
-        elif name.lower() == METALS.ZINC.lower():
-            return METALS.ZINC
-        else:
+        metal = METAL_NAMES.get(name)
+        if metal is None:
+            metal = METAL_NAMES.get(name.lower())
+        if metal is None:
             raise NotImplementedError
+        return metal
 
 
 class QUALITY(Enum):
@@ -38,3 +41,27 @@ class QUALITY(Enum):
     @classmethod
     def get_all_qualities(cls) -> List:
         return ["AA", "A", "B", "C"]
+
+    @staticmethod
+    def from_value(value: Any) -> "QUALITY":
+        # Same as QUALITY(value) with a table lookup, for members and quality names
+        try:
+            return QUALITY_LOOKUP.get(value, QUALITY.DEFAULT)
+        except TypeError:
+            return QUALITY.DEFAULT
+
+
+# Integer codes of metals and qualities, e.g. to index price and sensitivity arrays in batch kernels
+METALS_BY_CODE = (METALS.COPPER, METALS.ZINC)
+QUALITIES_BY_CODE = (QUALITY.DEFAULT, QUALITY.C, QUALITY.B, QUALITY.A, QUALITY.AA)
+METAL_CODES = {metal: code for code, metal in enumerate(METALS_BY_CODE)}
+QUALITY_CODES = {quality: code for code, quality in enumerate(QUALITIES_BY_CODE)}
+
+# Lookup tables for parsing: metal names in lower case, quality members and names
+METAL_NAMES = {
+    name: metal for metal in METALS_BY_CODE for name in (metal, metal.lower())
+}
+QUALITY_LOOKUP = {
+    **{quality.value: quality for quality in QUALITIES_BY_CODE},
+    **{quality: quality for quality in QUALITIES_BY_CODE},
+}
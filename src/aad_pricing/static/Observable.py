@@ -0,0 +1,36 @@
+# External dependencies
+import inspect
+import weakref
+
+
+class Observable(object):
+    """
+    Class Observable keeps a list of listeners that are called after the data of the object changes.
+
+    Bound methods are held by weak reference, so listening to data doesn't keep e.g. an order book alive.
+    """
+
+    def __init__(self) -> None:
+        self._listeners = []
+
+    def add_listener(self, listener) -> None:
+        if inspect.ismethod(listener):
+            self._listeners.append(weakref.WeakMethod(listener))
+        else:
+            self._listeners.append(lambda: listener)
+
+    def remove_listener(self, listener) -> None:
+        # Bound methods compare equal if they bind the same function to the same object
+        self._listeners = [
+            listener_ref
+            for listener_ref in self._listeners
+            if listener_ref() != listener
+        ]
+
+    def _notify_listeners(self, *args) -> None:
+        for listener_ref in list(self._listeners):
+            listener = listener_ref()
+            if listener is None:
+                self._listeners.remove(listener_ref)
+            else:
+                listener(*args)
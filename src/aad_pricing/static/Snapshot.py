@@ -0,0 +1,30 @@
+# External dependencies
+import hashlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cached_property
+
+
+@dataclass(frozen=True)
+class Snapshot(ABC):
+    """
+    Class Snapshot is the base class of immutable copies of static and market data.
+
+    Snapshots can be shared between threads and pickled to other processes. The content hash only depends on
+    the data, not on the process or the object identity, so it can be used to memoize pricing results.
+    Subclasses define their canonical content in _canonical.
+    """
+
+    @abstractmethod
+    def _canonical(self) -> tuple:
+        # Hashable content of the snapshot, in a stable order
+        pass
+
+    def snapshot(self) -> "Snapshot":
+        # Snapshots can be used wherever live data is snapshotted
+        return self
+
+    @cached_property
+    def content_hash(self) -> str:
+        payload = repr((type(self).__name__, self._canonical()))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,12 +1,15 @@
 # External dependencies
-from typing import Tuple, List
-from functools import reduce
+from dataclasses import dataclass
+from typing import Optional, Tuple, List
+from functools import cached_property, reduce
 import numpy as np
 import warnings
 import bisect
 
 # Internal dependencies
 from aad_pricing.static.Constants import METALS
+from aad_pricing.static.Observable import Observable
+from aad_pricing.static.Snapshot import Snapshot
 
 
 def is_sorted(iterable):
@@ -15,16 +18,56 @@ def is_sorted(iterable):
     return not np.isnan(reduce(previous_or_nan, iterable))
 
 
-class StaticData(object):
+def changed_labour_bands(
+    previous: List[Tuple[float, float]], current: List[Tuple[float, float]]
+) -> set:
+    # Entry k of the table holds the lower bound and factor of band k and the upper bound of band k - 1
+    if len(previous) == 0:
+        return set()
+    bands = set()
+    for k in range(max(len(previous), len(current))):
+        if k >= len(previous) or k >= len(current) or previous[k] != current[k]:
+            bands.update((k, k - 1) if k > 0 else (k,))
+    return bands
+
+
+def labour_band(lengths: Tuple[float, ...], rod_length: float) -> int:
+    # Index of the labour factor band of the rod length, bisect is faster than NumPy for a single length
+    check_labour_range(rod_length >= lengths[0], lengths)
+    return max(bisect.bisect_left(lengths, rod_length) - 1, 0)
+
+
+def check_labour_range(in_range: bool, lengths: Tuple[float, ...]) -> None:
+    # The comparisons with the first breakpoint are also False for NaN lengths
+    if not in_range:
+        raise ValueError(
+            "Rod lengths must be at least the first labour factor breakpoint "
+            + str(lengths[0])
+        )
+
+
+class StaticData(Observable):
     """
     Class StaticData contains information about copper : zinc mass ratios in brass,
     as well as the labour factors associated with different rod lengths.
+
+    Labour factor band k covers rod lengths in (length_k, length_k+1], the first band also includes its
+    lower bound and the last band is open-ended. Lengths below the first breakpoint are rejected.
     """
 
-    # Alloy composition by weight fractions
-    _alloy_composition = {}
-    # Labour factor to account for production effort of rod length. Data structure: list( (max_length, labour_factor) ... )
-    _labour_factors = []
+    def __init__(self) -> None:
+        # Listeners are notified with (attribute, previous value) after the alloy composition or labour factors change
+        super().__init__()
+        # Alloy composition by weight fractions
+        self._alloy_composition = {}
+        # Labour factor to account for production effort of rod length. Data structure: list( (min_length, labour_factor) ... )
+        self._labour_factors = []
+        # Sorted band lower bounds and factors of the labour factor table, for lookups
+        self._labour_lengths = ()
+        self._labour_breakpoints = np.empty(0)
+        self._labour_factor_values = np.empty(0)
+        # Snapshot of the current data, taken on demand and reset by every update
+        self._snapshot = None
 
     def alloy_validator(setter_func):
         def function_wrapper(self, copper_fraction: float):
@@ -37,8 +80,11 @@ class StaticData(object):
 
     @alloy_validator
     def set_copper_fraction(self, copper_fraction: float) -> None:
+        previous = self._alloy_composition.get(METALS.COPPER)
         self._alloy_composition[METALS.COPPER] = copper_fraction
         self._alloy_composition[METALS.ZINC] = 1.0 - copper_fraction
+        self._snapshot = None
+        self._notify_listeners("copper_fraction", previous)
 
     def get_alloy_mass_fraction(self, metal: METALS) -> float:
         return self._alloy_composition[metal]
@@ -59,10 +105,77 @@ class StaticData(object):
 
     @labour_factor_validator
     def set_labour_factors(self, labour_factors: List[Tuple[float, float]]) -> None:
+        previous = self._labour_factors
         self._labour_factors = labour_factors
+        lengths, factors = zip(*labour_factors)
+        self._labour_lengths = lengths
+        self._labour_breakpoints = np.asarray(lengths, dtype=float)
+        self._labour_factor_values = np.asarray(factors, dtype=float)
+        self._snapshot = None
+        self._notify_listeners("labour_factors", previous)
+
+    def get_labour_factor_table(self) -> List[Tuple[float, float]]:
+        return list(self._labour_factors)
+
+    def get_labour_band(self, rod_length: float) -> int:
+        return labour_band(self._labour_lengths, rod_length)
+
+    def get_labour_bands(self, rod_lengths: np.ndarray) -> np.ndarray:
+        breakpoints = self._labour_breakpoints
+        check_labour_range(np.all(rod_lengths >= breakpoints[0]), self._labour_lengths)
+        bands = np.searchsorted(breakpoints, rod_lengths, side="left") - 1
+        # A length equal to the first breakpoint belongs to the first band
+        return np.maximum(bands, 0)
 
     def get_labour_factor(self, rod_length: float) -> float:
-        factor_idx = (
-            bisect.bisect_left([x[0] for x in self._labour_factors], rod_length) - 1
-        )
-        return self._labour_factors[factor_idx][1]
+        return self._labour_factors[self.get_labour_band(rod_length)][1]
+
+    def get_labour_factors(self, rod_lengths: np.ndarray) -> np.ndarray:
+        # Vectorised get_labour_factor, resolves the labour factors of a whole book in one call
+        return self._labour_factor_values[self.get_labour_bands(rod_lengths)]
+
+    def snapshot(self) -> "StaticDataSnapshot":
+        if self._snapshot is None:
+            copper_fraction = self._alloy_composition.get(METALS.COPPER)
+            self._snapshot = StaticDataSnapshot(
+                None if copper_fraction is None else float(copper_fraction),
+                tuple((float(x[0]), float(x[1])) for x in self._labour_factors),
+            )
+        return self._snapshot
+
+
+@dataclass(frozen=True)
+class StaticDataSnapshot(Snapshot):
+    """
+    Class StaticDataSnapshot is an immutable copy of the alloy composition and labour factors of StaticData.
+
+    It provides the getters of StaticData that price an order, so it can be passed to ClientOrder instead.
+    """
+
+    copper_fraction: Optional[float]
+    labour_factors: Tuple[Tuple[float, float], ...]
+
+    def _canonical(self) -> tuple:
+        return (self.copper_fraction, self.labour_factors)
+
+    def get_alloy_mass_fraction(self, metal: METALS) -> float:
+        if self.copper_fraction is None:
+            raise KeyError(metal)
+        if metal == METALS.COPPER:
+            return self.copper_fraction
+        elif metal == METALS.ZINC:
+            return 1.0 - self.copper_fraction
+        raise KeyError(metal)
+
+    def get_labour_factor_table(self) -> List[Tuple[float, float]]:
+        return list(self.labour_factors)
+
+    @cached_property
+    def _labour_lengths(self) -> Tuple[float, ...]:
+        return tuple(x[0] for x in self.labour_factors)
+
+    def get_labour_band(self, rod_length: float) -> int:
+        return labour_band(self._labour_lengths, rod_length)
+
+    def get_labour_factor(self, rod_length: float) -> float:
+        return self.labour_factors[self.get_labour_band(rod_length)][1]
@@ -1 +1,11 @@
-__all__ = ["Constants", "StaticData"]
+# External dependencies
+import importlib
+
+__all__ = ["Constants", "Observable", "Snapshot", "StaticData"]
+
+
+def __getattr__(name: str):
+    # Modules are imported on first access, importing the package itself stays cheap
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,155 @@
+# External dependencies
+import pytest
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.BatchOrderBook import (
+    BatchOrderBook,
+    graph_kernel,
+    replay_kernel,
+)
+from aad_pricing.pricing.DirectedAcyclicGraph import INPUT_NAMES
+from aad_pricing.pricing.ShardedExecutor import ShardedExecutor
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+
+
+@pytest.fixture
+def static_data():
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    return static_data
+
+
+@pytest.fixture
+def market_data():
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), [7.5, 4.9, 3.5, 3.05]):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+    return market_data
+
+
+def random_orders(n_orders, seed=0):
+    rng = np.random.default_rng(seed)
+    qualities = QUALITY.get_all_qualities()
+    return {
+        k: [
+            "Client " + str(k),
+            float(rng.uniform(1.0, 30000.0)),
+            float(rng.uniform(0.0, 200.0)),
+            qualities[rng.integers(len(qualities))],
+        ]
+        for k in range(n_orders)
+    }
+
+
+@pytest.mark.parametrize("n_orders", [1, 3, 250])
+def test_batch_prices_match_order_book(n_orders, static_data, market_data):
+    orders = random_orders(n_orders)
+    order_book, batch_book = OrderBook(static_data), BatchOrderBook(static_data)
+    order_book.add_orders(orders, market_data)
+    batch_book.add_orders(orders, market_data)
+
+    assert batch_book.get_order_prices() == order_book.get_order_prices()
+
+
+@pytest.mark.parametrize("metal", [METALS.COPPER, METALS.ZINC])
+def test_batch_sensitivities_match_order_book(metal, static_data, market_data):
+    orders = random_orders(250)
+    order_book, batch_book = OrderBook(static_data), BatchOrderBook(static_data)
+    order_book.add_orders(orders, market_data)
+    batch_book.add_orders(orders, market_data)
+
+    expected = [
+        order.get_sensitivity(metal) for order in order_book._client_orders.values()
+    ]
+    assert batch_book.get_sensitivities(metal).tolist() == expected
+
+
+def test_batch_overwrite_keeps_order_position(static_data, market_data):
+    order_book, batch_book = OrderBook(static_data), BatchOrderBook(static_data)
+    for book in (order_book, batch_book):
+        book.add_orders(random_orders(5, seed=1), market_data)
+        with pytest.warns(UserWarning, match="Overwriting client order"):
+            book.add_orders(
+                {2: ["Client X", 10.0, 80.0, "B"], 7: ["Client Y", 5.0, 120.0, "C"]},
+                market_data,
+            )
+
+    assert len(batch_book) == 6
+    assert batch_book.get_order_prices() == order_book.get_order_prices()
+
+
+@pytest.mark.parametrize(
+    "backend, workers, chunk_size, kernel",
+    [
+        ("serial", 1, 7, replay_kernel),
+        ("thread", 3, 16, replay_kernel),
+        ("thread", 2, 1000, replay_kernel),
+        ("process", 2, 40, replay_kernel),
+        ("thread", 2, 33, graph_kernel),
+    ],
+)
+def test_sharded_pricing_matches_serial(
+    backend, workers, chunk_size, kernel, static_data, market_data
+):
+    orders = random_orders(100)
+    serial_book = BatchOrderBook(static_data)
+    serial_book.add_orders(orders, market_data)
+
+    with ShardedExecutor(workers, chunk_size, backend) as executor:
+        sharded_book = BatchOrderBook(static_data, executor=executor, kernel=kernel)
+        sharded_book.add_orders(orders, market_data)
+
+        assert sharded_book.get_order_prices() == serial_book.get_order_prices()
+        for metal in (METALS.COPPER, METALS.ZINC):
+            assert np.array_equal(
+                sharded_book.get_sensitivities(metal),
+                serial_book.get_sensitivities(metal),
+            )
+
+
+def test_sharded_executor_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        ShardedExecutor(backend="gpu")
+
+
+@pytest.mark.parametrize("compact_orders", [False, True])
+def test_batch_jacobian_matches_order_book(compact_orders, static_data, market_data):
+    orders = random_orders(250)
+    order_book = OrderBook(static_data, compact_orders=compact_orders)
+    batch_book = BatchOrderBook(static_data)
+    order_book.add_orders(orders, market_data)
+    batch_book.add_orders(orders, market_data)
+
+    jacobian = batch_book.get_jacobian()
+    assert jacobian.shape == (250, len(INPUT_NAMES))
+    assert np.array_equal(jacobian, order_book.get_jacobian())
+
+    # Columns in INPUT_NAMES order: the copper and zinc price columns scale to the sensitivities
+    columns = batch_book._columns
+    copper, zinc = INPUT_NAMES.index("copper_price"), INPUT_NAMES.index("zinc_price")
+    assert np.allclose(
+        jacobian[:, copper] * columns["copper_price"],
+        batch_book.get_sensitivities(METALS.COPPER),
+    )
+    assert np.allclose(
+        jacobian[:, zinc] * columns["zinc_price"],
+        batch_book.get_sensitivities(METALS.ZINC),
+    )
+    # The price is linear in the weight and in the labour factor
+    prices = batch_book.get_prices()
+    weight, labour = INPUT_NAMES.index("total_weight"), INPUT_NAMES.index(
+        "labour_factor"
+    )
+    assert np.allclose(jacobian[:, weight] * columns["weight"], prices)
+    assert np.allclose(jacobian[:, labour] * columns["labour_factor"], prices)
+
+
+def test_empty_book_jacobian(static_data):
+    assert BatchOrderBook(static_data).get_jacobian().shape == (0, len(INPUT_NAMES))
+    assert OrderBook(static_data).get_jacobian().shape == (0, len(INPUT_NAMES))
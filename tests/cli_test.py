@@ -0,0 +1,92 @@
+# External dependencies
+import json
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+
+# Internal dependencies
+from aad_pricing.cli import run
+from aad_pricing.pricing.OrderBook import price_shock_surface
+
+ORDERS = pd.DataFrame(
+    {
+        "client": ["User 1", "User 2", "User 3"],
+        "weight": [2340, 1820, 27040],
+        "rod_length": [108, 144, 93],
+        "zinc_quality": ["AA", "B", "C"],
+    }
+)
+
+
+@pytest.fixture
+def order_file(tmp_path):
+    path = tmp_path / "orders.csv"
+    ORDERS.to_csv(path, index=False)
+    return path
+
+
+def test_cli_prices_order_file(order_file, tmp_path, capsys):
+    output_path = tmp_path / "prices.csv"
+
+    exit_code = run([str(order_file), "-o", str(output_path), "--workers", "2"])
+
+    assert exit_code == 0
+    assert len(pd.read_csv(output_path)) == 3
+    output = capsys.readouterr().out
+    assert "Priced 3 orders" in output
+    assert "orders/s" in output
+    assert "Peak memory" in output
+
+
+def test_cli_reads_data_files_and_writes_shock_grid(order_file, tmp_path):
+    static_path, market_path = tmp_path / "static.json", tmp_path / "market.json"
+    static_path.write_text(
+        json.dumps({"copper_fraction": 0.5, "labour_factors": [[0, 1.0]]})
+    )
+    market_path.write_text(json.dumps({"copper": 10.0, "zinc": {"aa": 2.0}}))
+    output_path, grid_path = tmp_path / "prices.csv", tmp_path / "grid.csv"
+
+    exit_code = run(
+        [str(order_file), "-o", str(output_path), "--static-data", str(static_path)]
+        + ["--market-data", str(market_path), "--copper-price", "12.0"]
+        + ["--shock-grid", str(grid_path), "--shock-steps", "5"]
+    )
+    prices = pd.read_csv(output_path)
+    grid = pd.read_csv(grid_path)
+
+    assert exit_code == 0
+    # Copper price from the command line, zinc AA price from the market data file
+    assert np.isclose(prices["price"][0], 2340 * (0.5 * 12.0 + 0.5 * 2.0))
+    _, _, price_change = price_shock_surface(
+        prices["zinc_sensitivity"].sum(),
+        prices["copper_sensitivity"].sum(),
+        [-10, 10],
+        [-10, 10],
+        5,
+    )
+    assert len(grid) == 25
+    assert np.allclose(grid["price_change"], price_change.ravel())
+
+
+def test_cli_invalid_input_failure(order_file, tmp_path, capsys):
+    exit_code = run(
+        [str(order_file), "-o", str(tmp_path / "prices.csv"), "--zinc-prices", "D=1"]
+    )
+
+    assert exit_code == 1
+    assert "Unknown zinc quality" in capsys.readouterr().err
+
+
+def test_cli_does_not_import_web_framework():
+    modules = subprocess.run(
+        [sys.executable, "-c", "import sys, aad_pricing.cli; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    ).stdout.split()
+
+    assert not {"dash", "plotly", "flask"} & set(modules)
@@ -0,0 +1,94 @@
+# External dependencies
+import pytest
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.BatchOrderBook import BatchOrderBook
+from aad_pricing.pricing.DirectedAcyclicGraph import DirectedAcyclicGraph
+from aad_pricing.external_input.MarketData import MarketData
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+
+INPUTS = [
+    (1.0, 1.0, 20.0, 5.0, 1.0),
+    (2.0, 0.8, 10.54, 5.0, 1.2),
+    (100.0, 0.3, 12.025, 8.32, 1.1),
+    (950.0, 0.66, 20.4, 15.0, 1.9),
+]
+INPUT_NAMES = (
+    "total_weight",
+    "copper_fraction",
+    "copper_price",
+    "zinc_price",
+    "labour_factor",
+)
+
+
+@pytest.mark.parametrize("inputs", INPUTS)
+def test_scalar_replay_matches_graph(inputs):
+    compiled = DirectedAcyclicGraph.compile()
+    graph = DirectedAcyclicGraph(*inputs)
+
+    price, gradient = compiled.replay(dict(zip(INPUT_NAMES, inputs)))
+
+    assert price == graph.get_price()
+    assert gradient["copper_price"] * inputs[2] == graph.get_price_sensitivity(
+        METALS.COPPER
+    )
+    assert gradient["zinc_price"] * inputs[3] == graph.get_price_sensitivity(
+        METALS.ZINC
+    )
+    # d(price)/d(weight) = alloy price per kg * labour factor
+    assert np.isclose(
+        gradient["total_weight"],
+        (inputs[1] * inputs[2] + (1.0 - inputs[1]) * inputs[3]) * inputs[4],
+    )
+
+
+def test_array_replay_matches_graphs():
+    compiled = DirectedAcyclicGraph.compile()
+    columns = {
+        name: np.array(values) for name, values in zip(INPUT_NAMES, zip(*INPUTS))
+    }
+
+    prices, gradient = compiled.replay(columns)
+
+    for k, inputs in enumerate(INPUTS):
+        graph = DirectedAcyclicGraph(*inputs)
+        assert prices[k] == graph.get_price()
+        assert gradient["copper_price"][k] * inputs[2] == graph.get_price_sensitivity(
+            METALS.COPPER
+        )
+
+
+def test_compiled_graph_is_reusable():
+    compiled = DirectedAcyclicGraph.compile()
+    first = compiled.evaluate(dict(zip(INPUT_NAMES, INPUTS[1])))
+    compiled.evaluate(dict(zip(INPUT_NAMES, INPUTS[2])))
+
+    assert compiled.evaluate(dict(zip(INPUT_NAMES, INPUTS[1]))) == first
+
+
+def test_batch_reprice_after_market_tick():
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    market_data.set_price(3.5, METALS.ZINC, QUALITY.B)
+    orders = {0: ["User 1", 2340, 108, "B"], 1: ["User 2", 1820, 144, "B"]}
+
+    book = BatchOrderBook(static_data)
+    book.add_orders(orders, market_data)
+    book.get_order_prices()
+
+    market_data.set_price(9.0, METALS.COPPER, QUALITY.DEFAULT)
+    book.reprice(market_data)
+    fresh_book = BatchOrderBook(static_data)
+    fresh_book.add_orders(orders, market_data)
+
+    assert book.get_order_prices() == fresh_book.get_order_prices()
+    assert np.array_equal(
+        book.get_sensitivities(METALS.COPPER),
+        fresh_book.get_sensitivities(METALS.COPPER),
+    )
@@ -0,0 +1,44 @@
+# External dependencies
+import pytest
+
+# Internal dependencies
+from aad_pricing.static.Constants import (
+    METALS,
+    METAL_CODES,
+    METALS_BY_CODE,
+    QUALITY,
+    QUALITY_CODES,
+    QUALITIES_BY_CODE,
+)
+
+
+def test_metals_read_as_values():
+    assert METALS.COPPER == "Copper"
+    assert METALS.ZINC == "Zinc"
+    assert [metal.value for metal in METALS] == ["Copper", "Zinc"]
+    assert METALS("Zinc") is METALS["ZINC"]
+
+
+@pytest.mark.parametrize(
+    "name, metal", [("Copper", "Copper"), ("zinc", "Zinc"), ("COPPER", "Copper")]
+)
+def test_metal_from_string(name, metal):
+    assert METALS.from_string(name) == metal
+
+
+def test_unknown_metal_from_string():
+    with pytest.raises(NotImplementedError):
+        METALS.from_string("Gold")
+
+
+@pytest.mark.parametrize("value", ["AA", "A", "B", "C", "D", "", 1, None, QUALITY.B])
+def test_quality_from_value_matches_enum(value):
+    assert QUALITY.from_value(value) is QUALITY(value)
+
+
+def test_codes_index_members():
+    assert [METALS_BY_CODE[code] for code in METAL_CODES.values()] == list(METAL_CODES)
+    assert [QUALITIES_BY_CODE[code] for code in QUALITY_CODES.values()] == list(
+        QUALITY_CODES
+    )
+    assert QUALITY_CODES[QUALITY.DEFAULT] == 0
@@ -1,9 +1,16 @@
 # External dependencies
+import gc
 import pytest
 import numpy as np
 
 # Internal dependencies
+from aad_pricing.pricing.ComputationalNode import (
+    ComputationalNode,
+    backward,
+    clear_gradients,
+)
 from aad_pricing.pricing.DirectedAcyclicGraph import DirectedAcyclicGraph
+from aad_pricing.pricing.DualNumber import DualNumber
 from aad_pricing.static.Constants import METALS
 
 
@@ -80,3 +87,211 @@ def test_zinc_price_sensitivity(
         weight * labour_factor * (1.0 - copper_fraction) * zinc_price
     )
     assert np.isclose(zinc_price_sensitivity, theoretical_sensitivity)
+
+
+VECTOR_INPUTS = [
+    (1.0, 1.0, 20.0, 5.0, 1.0),
+    (2.0, 0.8, 10.54, 5.0, 1.2),
+    (50.0, 0.7, 11.78, 5.3, 1.4),
+    (100.0, 0.3, 12.025, 8.32, 1.1),
+    (950.0, 0.66, 20.4, 15.0, 1.9),
+]
+
+
+def test_vector_mode_prices_orders_at_once():
+    columns = [list(column) for column in zip(*VECTOR_INPUTS)]
+    graph = DirectedAcyclicGraph(*columns)
+
+    prices = graph.get_price()
+    copper_sensitivities = graph.get_price_sensitivity(METALS.COPPER)
+    zinc_sensitivities = graph.get_price_sensitivity(METALS.ZINC)
+
+    for k, inputs in enumerate(VECTOR_INPUTS):
+        scalar_graph = DirectedAcyclicGraph(*inputs)
+        assert prices[k] == scalar_graph.get_price()
+        assert copper_sensitivities[k] == scalar_graph.get_price_sensitivity(
+            METALS.COPPER
+        )
+        assert zinc_sensitivities[k] == scalar_graph.get_price_sensitivity(METALS.ZINC)
+
+
+def test_vector_mode_prices_market_scenarios():
+    # One order, copper price scenarios as an array broadcast against scalar inputs
+    copper_scenarios = np.linspace(5.0, 15.0, 11)
+    graph = DirectedAcyclicGraph(100.0, 0.66, copper_scenarios, 3.5, 1.15)
+
+    verified_prices = 100.0 * 1.15 * (0.66 * copper_scenarios + 0.34 * 3.5)
+    assert np.allclose(graph.get_price(), verified_prices)
+    assert np.allclose(
+        graph.get_price_sensitivity(METALS.COPPER),
+        100.0 * 1.15 * 0.66 * copper_scenarios,
+    )
+    assert np.allclose(
+        graph.get_price_sensitivity(METALS.ZINC),
+        np.full_like(copper_scenarios, 100.0 * 1.15 * 0.34 * 3.5),
+    )
+
+
+def test_forward_over_reverse_hessian_on_nonlinear_graph():
+    # f = x * x * y seeded along x: adjoint tangents give d2f/dx2 = 2y and d2f/dxdy = 2x
+    x = ComputationalNode(DualNumber(3.0, 1.0))
+    y = ComputationalNode(DualNumber(2.0, 0.0))
+    f = x * x * y
+    f.set_gradient(1.0)
+
+    assert np.isclose(x.get_gradient().value, 12.0)
+    assert np.isclose(x.get_gradient().tangent, 4.0)
+    assert np.isclose(y.get_gradient().value, 9.0)
+    assert np.isclose(y.get_gradient().tangent, 6.0)
+
+
+@pytest.mark.parametrize(
+    "metal_a,metal_b",
+    [
+        (METALS.COPPER, METALS.COPPER),
+        (METALS.COPPER, METALS.ZINC),
+        (METALS.ZINC, METALS.ZINC),
+    ],
+)
+def test_price_gamma_vanishes_for_linear_model(metal_a, metal_b):
+    graph = DirectedAcyclicGraph(950.0, 0.66, 20.4, 15.0, 1.9)
+
+    assert graph.get_price_gamma(metal_a, metal_b) == 0.0
+
+
+def test_shocked_price_matches_repriced_graph():
+    graph = DirectedAcyclicGraph(950.0, 0.66, 20.4, 15.0, 1.9)
+    copper_shocks = np.array([-0.1, 0.0, 0.25])
+
+    shocked_prices = graph.get_shocked_price(copper_shocks, 0.05)
+
+    for k, shock in enumerate(copper_shocks):
+        repriced = DirectedAcyclicGraph(950.0, 0.66, 20.4 * (1 + shock), 15.75, 1.9)
+        assert np.isclose(shocked_prices[k], repriced.get_price())
+
+
+def test_backward_on_deep_chain():
+    # Deep enough to exceed the recursion limit of a recursive sweep
+    x = ComputationalNode(1.0001)
+    one = ComputationalNode(1.0)
+    y = x
+    for _ in range(10_000):
+        y = y * x + one - one
+
+    order = backward(y)
+    assert order[-1] is y
+    assert np.isclose(x.get_gradient(), 10_001 * 1.0001**10_000)
+    assert one.get_gradient() == 0.0
+
+
+def test_gradient_on_deep_chain():
+    # Seeding and reading gradients through the node interface sweeps without recursion too
+    x = ComputationalNode(1.0001)
+    one = ComputationalNode(1.0)
+    y = x
+    for _ in range(10_000):
+        y = y * x + one - one
+
+    y.set_gradient(1.0)
+    assert np.isclose(y.get_value(), 1.0001**10_001)
+    assert np.isclose(x.get_gradient(), 10_001 * 1.0001**10_000)
+
+
+def test_backward_for_several_outputs():
+    x = ComputationalNode(3.0)
+    y = ComputationalNode(2.0)
+    f = x * y
+    g = f + x
+
+    backward(g)
+    assert (x.get_gradient(), y.get_gradient()) == (3.0, 3.0)
+    backward(f)
+    assert (x.get_gradient(), y.get_gradient()) == (2.0, 3.0)
+    backward(f, seed=DualNumber(2.0, 1.0))
+    assert x.get_gradient().value == 4.0 and x.get_gradient().tangent == 2.0
+
+    # An intermediate node used by later operands receives its whole adjoint before passing it on:
+    # h = xy + xy * y, dh/dx = y + y^2, dh/dy = x + 2xy
+    h = x + f * y - x + f
+    backward(h)
+    assert (x.get_gradient(), y.get_gradient()) == (6.0, 15.0)
+
+    # Cleared adjoints are zero until an output is seeded again
+    clear_gradients(g)
+    assert (x.get_gradient(), y.get_gradient()) == (0.0, 0.0)
+    g.set_gradient(1.0)
+    assert (x.get_gradient(), y.get_gradient()) == (3.0, 3.0)
+
+
+def test_graph_is_freed_without_cycle_collection():
+    # Nodes only link to the nodes computed from them, so a dropped graph is freed by reference counting
+    gc.collect()
+    gc.disable()
+    try:
+        graph = DirectedAcyclicGraph(950.0, 0.66, 20.4, 15.0, 1.9)
+        graph.get_jacobian("labour_cost")
+        del graph
+        assert gc.collect() == 0
+    finally:
+        gc.enable()
+
+
+def test_jacobian_of_vector_graph_outputs():
+    copper_prices = np.array([18.0, 20.4, 23.0])
+    labour_factors = np.array([1.9, 1.9, 2.1])
+    graph = DirectedAcyclicGraph(950.0, 0.66, copper_prices, 15.0, labour_factors)
+    jacobian = graph.get_jacobian("material_cost")
+
+    assert np.allclose(jacobian["copper_price"], 950.0 * 0.66)
+    assert np.allclose(jacobian["total_weight"], 0.66 * copper_prices + 0.34 * 15.0)
+    assert np.array_equal(jacobian["labour_factor"], np.zeros(3))
+
+
+@pytest.mark.parametrize("use_tape", [False, True])
+def test_jacobian_of_graph_outputs(use_tape):
+    weight, copper_fraction, copper_price, zinc_price, labour_factor = (
+        950.0,
+        0.66,
+        20.4,
+        15.0,
+        1.9,
+    )
+    graph = DirectedAcyclicGraph(
+        weight, copper_fraction, copper_price, zinc_price, labour_factor, use_tape
+    )
+    price_sensitivity = graph.get_price_sensitivity(METALS.COPPER)
+    metal_price = copper_fraction * copper_price + (1.0 - copper_fraction) * zinc_price
+    material_jacobian = {
+        "total_weight": metal_price,
+        "copper_fraction": weight * (copper_price - zinc_price),
+        "copper_price": weight * copper_fraction,
+        "zinc_price": weight * (1.0 - copper_fraction),
+        "labour_factor": 0.0,
+    }
+
+    assert np.isclose(graph.get_material_cost(), weight * metal_price)
+    assert np.isclose(
+        graph.get_labour_cost(), weight * metal_price * (labour_factor - 1.0)
+    )
+    for output, scale in [
+        ("price", labour_factor),
+        ("labour_cost", labour_factor - 1.0),
+    ]:
+        jacobian = graph.get_jacobian(output)
+        for name, derivative in material_jacobian.items():
+            if name != "labour_factor":
+                assert np.isclose(jacobian[name], derivative * scale)
+        assert np.isclose(jacobian["labour_factor"], weight * metal_price)
+    jacobian = graph.get_jacobian("material_cost")
+    for name, derivative in material_jacobian.items():
+        assert np.isclose(jacobian[name], derivative)
+
+    # Sweeping other outputs leaves the price sensitivities as they were
+    assert graph.get_price_sensitivity(METALS.COPPER) == price_sensitivity
+
+
+def test_unknown_graph_output():
+    graph = DirectedAcyclicGraph(950.0, 0.66, 20.4, 15.0, 1.9)
+
+    with pytest.raises(KeyError, match="Unknown graph output"):
+        graph.get_jacobian("margin")
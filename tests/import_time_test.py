@@ -0,0 +1,59 @@
+# External dependencies
+import os
+import subprocess
+import sys
+import pytest
+
+# Modules that must import without the web interface or file formats
+CORE_MODULES = [
+    "aad_pricing.static.StaticData",
+    "aad_pricing.external_input.MarketData",
+    "aad_pricing.external_input.ClientOrder",
+    "aad_pricing.external_input.OrderFile",
+    "aad_pricing.pricing.OrderBook",
+    "aad_pricing.pricing.BatchOrderBook",
+    "aad_pricing.cli",
+]
+HEAVY_PACKAGES = {
+    "dash",
+    "dash_bootstrap_components",
+    "plotly",
+    "flask",
+    "pandas",
+    "pyarrow",
+}
+
+
+def import_times(module: str) -> dict:
+    # `python -X importtime` report as {module: (self seconds, cumulative seconds)}
+    report = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    ).stderr
+
+    times = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, cumulative_time, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_time) / 1e6, int(cumulative_time) / 1e6)
+    return times
+
+
+def test_package_import_is_lazy():
+    times = import_times("aad_pricing")
+
+    assert "numpy" not in times
+    assert "aad_pricing.index" not in times
+
+
+# Import times are benchmarked in benchmarks/pricing_hot_paths_test.py
+@pytest.mark.parametrize("module", CORE_MODULES)
+def test_core_module_imports_no_heavy_packages(module):
+    times = import_times(module)
+
+    assert module in times
+    assert not HEAVY_PACKAGES & {name.split(".")[0] for name in times}
@@ -0,0 +1,118 @@
+# External dependencies
+import pytest
+
+# Internal dependencies
+from aad_pricing.pricing.Instrumentation import INSTRUMENTATION, Instrumentation
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+
+ORDERS = {
+    0: ["User 1", 2340, 108, "AA"],
+    1: ["User 2", 1820, 144, "B"],
+    2: ["User 3", 27040, 93, "C"],
+}
+
+
+@pytest.fixture
+def instrumentation():
+    INSTRUMENTATION.reset()
+    INSTRUMENTATION.enable()
+    yield INSTRUMENTATION
+    INSTRUMENTATION.disable()
+    INSTRUMENTATION.reset()
+
+
+def price_book():
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), [7.5, 4.9, 3.5, 3.05]):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    book.get_price_shock_effects([-10, 10], [-10, 10], 5)
+    market_data.set_price(4.0, METALS.ZINC, QUALITY.B)
+    return book.get_total_price()
+
+
+def test_hot_path_sections(instrumentation):
+    price_book()
+    report = instrumentation.report()
+
+    assert report["timers"]["graph_build"]["calls"] == 4
+    assert report["timers"]["forward_pass"]["calls"] == 4
+    assert report["timers"]["reverse_sweep"]["calls"] == 4
+    assert report["timers"]["shock_grid_build"]["calls"] == 1
+    assert report["counters"] == {"orders_priced": 3, "orders_repriced": 1}
+
+
+def test_disabled_instrumentation_records_nothing():
+    INSTRUMENTATION.reset()
+    price_book()
+    INSTRUMENTATION.record("graph_build", 1.0)
+
+    assert INSTRUMENTATION.report() == {
+        "enabled": False,
+        "timers": {},
+        "counters": {},
+    }
+
+
+def test_prometheus_text():
+    instrumentation = Instrumentation(enabled=True, prefix="test")
+    instrumentation.record("graph_build", 0.5)
+    instrumentation.record("graph_build", 1.5)
+    instrumentation.count('odd "name"', 3)
+
+    lines = instrumentation.prometheus_text().splitlines()
+    assert 'test_section_seconds_sum{section="graph_build"} 2.0' in lines
+    assert 'test_section_seconds_count{section="graph_build"} 2' in lines
+    assert 'test_section_seconds_max{section="graph_build"} 1.5' in lines
+    assert 'test_events_total{event="odd \\"name\\""} 3' in lines
+    assert "# TYPE test_section_seconds summary" in lines
+
+
+def test_callback_timer_and_profile(tmp_path):
+    instrumentation = Instrumentation(
+        enabled=True, profiler="cprofile", profile_dir=tmp_path
+    )
+
+    @instrumentation.callback("callback")
+    def callback(n):
+        return {"prices": list(range(n))}
+
+    assert callback(3) == {"prices": [0, 1, 2]}
+    callback(4)
+
+    report = instrumentation.report()
+    assert report["timers"]["callback.callback"]["calls"] == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "callback-1.prof",
+        "callback-2.prof",
+    ]
+
+
+def test_record_response():
+    instrumentation = Instrumentation(enabled=True)
+    instrumentation.record_response("..prices.data..", 0.25, 1200)
+    instrumentation.record_response("..prices.data..", 0.5, 800)
+
+    report = instrumentation.report()
+    assert report["timers"]["response...prices.data.."]["calls"] == 2
+    assert report["counters"] == {"response_bytes...prices.data..": 2000}
+
+    instrumentation.disable()
+    instrumentation.record_response("..prices.data..", 0.5, 800)
+    assert instrumentation.report()["counters"] == {
+        "response_bytes...prices.data..": 2000
+    }
+
+
+def test_unknown_profiler():
+    with pytest.raises(ValueError, match="Unknown profiler"):
+        Instrumentation(profiler="perf")
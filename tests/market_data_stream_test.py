@@ -0,0 +1,124 @@
+# External dependencies
+import asyncio
+import io
+import pytest
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.external_input.MarketData import MarketData
+from aad_pricing.external_input.MarketDataStream import (
+    MarketDataStream,
+    Tick,
+    parse_tick,
+    read_ticks,
+    replay_ticks,
+)
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+
+ORDERS = {
+    0: ["User 1", 2340, 108, "AA"],
+    1: ["User 2", 1820, 144, "B"],
+    2: ["User 3", 27040, 93, "C"],
+}
+
+TICKS_CSV = """timestamp,metal,quality,price
+0.0,Copper,,8.30
+0.0,zinc,B,3.60
+0.0,Zinc,B,3.70
+1.0,Zinc,c,3.10
+2.0,copper,DEFAULT,8.40
+"""
+
+
+@pytest.fixture
+def live_book():
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), [7.5, 4.9, 3.5, 3.05]):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    return static_data, market_data, book
+
+
+def expected_total(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    return book.get_order_prices()[2][-1]
+
+
+def test_read_ticks():
+    ticks = list(read_ticks(io.StringIO(TICKS_CSV)))
+
+    assert ticks[0] == Tick(0.0, METALS.COPPER, QUALITY.DEFAULT, 8.30)
+    assert ticks[1] == Tick(0.0, METALS.ZINC, QUALITY.B, 3.60)
+    assert ticks[3].quality == QUALITY.C
+    assert len(ticks) == 5
+
+
+@pytest.mark.parametrize(
+    "row,error",
+    [
+        (("0.0", "Gold", "", "8.3"), NotImplementedError),
+        (("0.0", "Copper", "", "-1.0"), ValueError),
+        (("0.0", "Zinc", "B", "abc"), ValueError),
+    ],
+)
+def test_parse_invalid_tick(row, error):
+    with pytest.raises(error):
+        parse_tick(*row)
+
+
+def test_process_coalesces_bursts(live_book):
+    static_data, market_data, book = live_book
+    stream = MarketDataStream(market_data, book)
+
+    updates = list(stream.process(read_ticks(io.StringIO(TICKS_CSV))))
+
+    # The burst at t=0 reprices every order, the zinc C tick only the C order
+    assert updates == [{0, 1, 2}, {2}, {0, 1, 2}]
+    assert market_data.get_price(METALS.ZINC, QUALITY.B) == 3.70
+    assert np.isclose(book.get_total_price(), expected_total(static_data, market_data))
+    statistics = stream.get_statistics()
+    assert statistics["ticks"] == 5
+    assert statistics["updates"] == 3
+
+
+def test_aprocess_async_feed(live_book):
+    static_data, market_data, book = live_book
+    stream = MarketDataStream(market_data, book)
+
+    async def consume():
+        ticks = replay_ticks(read_ticks(io.StringIO(TICKS_CSV)))
+        return [changed async for changed in stream.aprocess(ticks)]
+
+    updates = asyncio.run(consume())
+
+    assert set().union(*updates) == {0, 1, 2}
+    assert market_data.get_price(METALS.COPPER) == 8.40
+    assert np.isclose(book.get_total_price(), expected_total(static_data, market_data))
+    assert stream.get_statistics()["ticks"] == 5
+
+
+def test_aprocess_raises_tick_source_errors(live_book):
+    _, market_data, book = live_book
+    stream = MarketDataStream(market_data, book)
+
+    async def consume():
+        ticks = replay_ticks(read_ticks(["1,copper,default,8.3", "2,zinc,B,-5"]))
+        updates = []
+        with pytest.raises(ValueError):
+            async for changed in stream.aprocess(ticks):
+                updates.append(changed)
+        return updates
+
+    updates = asyncio.run(asyncio.wait_for(consume(), timeout=5.0))
+
+    # The copper tick before the invalid one is applied
+    assert updates == [{0, 1, 2}]
+    assert market_data.get_price(METALS.COPPER) == 8.3
@@ -47,3 +47,19 @@ def test_negative_price_failure(price, metal, quality):
 
     with pytest.raises(ValueError, match=r"Price must be a positive numeric value"):
         market_data.set_price(price, metal, quality)
+
+
+def test_market_data_snapshot():
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    market_data.set_price(3.5, METALS.ZINC, QUALITY.B)
+    snapshot = market_data.snapshot()
+    market_data.set_price(9.0, METALS.COPPER, QUALITY.DEFAULT)
+
+    assert snapshot.get_price(METALS.COPPER) == 8.22
+    assert snapshot.get_price(METALS.ZINC, QUALITY.B) == 3.5
+    assert snapshot.get_price(METALS.ZINC, QUALITY.AA) == 0.0
+    assert snapshot.content_hash != market_data.snapshot().content_hash
+
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    assert snapshot.content_hash == market_data.snapshot().content_hash
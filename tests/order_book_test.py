@@ -0,0 +1,361 @@
+# External dependencies
+import itertools
+import pytest
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.BatchOrderBook import BatchOrderBook
+from aad_pricing.pricing.BookGraph import BookGraph
+from aad_pricing.pricing.OrderBook import OrderBook, price_shock_surface
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+
+ORDERS = {
+    0: ["User 1", 2340, 108, "AA"],
+    1: ["User 2", 1820, 144, "B"],
+    2: ["User 3", 27040, 93, "C"],
+}
+
+
+@pytest.fixture
+def static_data():
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    return static_data
+
+
+@pytest.fixture
+def market_data():
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), [7.5, 4.9, 3.5, 3.05]):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+    return market_data
+
+
+@pytest.mark.parametrize(
+    "zinc_shock,copper_shock,n_steps",
+    [([-10, 10], [-10, 10], 5), ([-25, 5], [0, 20], 7), ([-1, 1], [-3, 3], 1)],
+)
+def test_price_shock_effects_match_per_order_shocks(
+    zinc_shock, copper_shock, n_steps, static_data, market_data
+):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+
+    zinc_ladder, copper_ladder, price_change = book.get_price_shock_effects(
+        zinc_shock, copper_shock, n_steps
+    )
+
+    assert price_change.shape == (n_steps, n_steps)
+    for (i, zn), (j, cu) in itertools.product(
+        enumerate(zinc_ladder), enumerate(copper_ladder)
+    ):
+        expected = sum(
+            order.get_sensitivity(METALS.ZINC) * zn / 100.0
+            + order.get_sensitivity(METALS.COPPER) * cu / 100.0
+            for order in book._client_orders.values()
+        )
+        assert np.isclose(price_change[i, j], expected)
+
+
+def test_price_shock_ladders_in_percentages(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+
+    zinc_ladder, copper_ladder, _ = book.get_price_shock_effects([-10, 10], [-5, 20], 3)
+
+    assert np.allclose(zinc_ladder, [-10.0, 0.0, 10.0])
+    assert np.allclose(copper_ladder, [-5.0, 7.5, 20.0])
+
+
+def test_batch_price_shock_effects_match_order_book(static_data, market_data):
+    book, batch_book = OrderBook(static_data), BatchOrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    batch_book.add_orders(ORDERS, market_data)
+
+    for expected, result in zip(
+        book.get_price_shock_effects([-10, 10], [-10, 10], 11),
+        batch_book.get_price_shock_effects([-10, 10], [-10, 10], 11),
+    ):
+        assert np.allclose(expected, result)
+
+
+@pytest.mark.parametrize("method", ["second_order", "aggregate", "full_revaluation"])
+def test_price_shock_methods_agree_for_linear_model(method, static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+
+    first_order = book.get_price_shock_effects([-20, 10], [-5, 25], 9)
+    result = book.get_price_shock_effects([-20, 10], [-5, 25], 9, method=method)
+
+    for expected, values in zip(first_order, result):
+        assert np.allclose(expected, values)
+
+
+def test_unknown_price_shock_method(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+
+    with pytest.raises(ValueError, match="Unknown price shock method"):
+        book.get_price_shock_effects([-10, 10], [-10, 10], 5, method="third_order")
+
+
+def test_second_order_price_shock_surface():
+    zinc_ladder, copper_ladder, price_change = price_shock_surface(
+        10.0, 20.0, [-10, 10], [-20, 20], 5, gammas=(4.0, -2.0, 8.0)
+    )
+
+    zn, cu = np.meshgrid(zinc_ladder / 100.0, copper_ladder / 100.0, indexing="ij")
+    expected = (
+        10.0 * zn
+        + 20.0 * cu
+        + 0.5 * 4.0 * zn**2
+        - 2.0 * zn * cu
+        + 0.5 * 8.0 * cu**2
+    )
+    assert np.allclose(price_change, expected)
+
+
+def totals_from_scratch(static_data, market_data, orders):
+    book = OrderBook(static_data)
+    book.add_orders(orders, market_data)
+    _, _, prices = book.get_order_prices()
+    return (
+        prices[-1],
+        book.get_total_sensitivity(METALS.COPPER),
+        book.get_total_sensitivity(METALS.ZINC),
+    )
+
+
+def book_totals(book):
+    return (
+        book.get_total_price(),
+        book.get_total_sensitivity(METALS.COPPER),
+        book.get_total_sensitivity(METALS.ZINC),
+    )
+
+
+def test_incremental_add_update_remove(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    assert np.allclose(
+        book_totals(book), totals_from_scratch(static_data, market_data, ORDERS)
+    )
+
+    book.add_order(3, ["User 4", 500, 80, "A"])
+    book.update_order(1, ["User 2", 1900, 60, "AA"])
+    book.remove_order(0)
+
+    expected_orders = {
+        1: ["User 2", 1900, 60, "AA"],
+        2: ORDERS[2],
+        3: ["User 4", 500, 80, "A"],
+    }
+    assert np.allclose(
+        book_totals(book),
+        totals_from_scratch(static_data, market_data, expected_orders),
+    )
+    assert book.get_order_prices()[1] == ["User 2", "User 3", "User 4", "TOTAL"]
+
+
+def test_update_unknown_order(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+
+    with pytest.raises(KeyError, match="Unknown client order id"):
+        book.update_order(10, ["User 9", 100, 80, "A"])
+
+
+def new_market_data(copper_price, zinc_prices):
+    market_data = MarketData()
+    market_data.set_price(copper_price, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), zinc_prices):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+    return market_data
+
+
+def new_static_data(copper_fraction, labour_factors):
+    static_data = StaticData()
+    static_data.set_copper_fraction(copper_fraction)
+    static_data.set_labour_factors(labour_factors)
+    return static_data
+
+
+def test_reprice_only_affected_orders(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    book.get_total_price()
+
+    # Only the order with zinc quality B is exposed to the zinc B price
+    market_data = new_market_data(8.22, [7.5, 4.9, 3.9, 3.05])
+    assert book.reprice(market_data=market_data) == {1}
+
+    # Only the order with rod length 93 sits in the 75-100 band
+    static_data = new_static_data(
+        0.66, [(0, 1.05), (75.0, 1.12), (100, 1.15), (125, 1.25)]
+    )
+    assert book.reprice(static_data=static_data) == {2}
+
+    # Every order depends on the copper price
+    market_data = new_market_data(9.0, [7.5, 4.9, 3.9, 3.05])
+    assert book.reprice(market_data=market_data) == {0, 1, 2}
+
+    assert np.allclose(
+        book_totals(book), totals_from_scratch(static_data, market_data, ORDERS)
+    )
+
+
+def test_replaced_data_does_not_notify_book(static_data, market_data, monkeypatch):
+    notified = []
+    for handler in ("_on_market_data_update", "_on_static_data_update"):
+        monkeypatch.setattr(
+            OrderBook,
+            handler,
+            lambda book, *args, handler=handler: notified.append(handler),
+        )
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    new_market = new_market_data(9.0, [7.5, 4.9, 3.9, 3.05])
+    new_static = new_static_data(0.7, [(0, 1.05), (75.0, 1.1), (100, 1.15)])
+    book.reprice(static_data=new_static, market_data=new_market)
+
+    market_data.set_price(4.0, METALS.ZINC, QUALITY.B)
+    static_data.set_copper_fraction(0.5)
+    assert notified == []
+    assert np.allclose(
+        book_totals(book), totals_from_scratch(new_static, new_market, ORDERS)
+    )
+
+    new_market.set_price(4.0, METALS.ZINC, QUALITY.B)
+    new_static.set_copper_fraction(0.5)
+    assert notified == ["_on_market_data_update", "_on_static_data_update"]
+
+
+def test_market_update_reprices_dependent_orders(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    changed = []
+    book.add_listener(changed.append)
+
+    market_data.set_price(3.9, METALS.ZINC, QUALITY.B)
+    market_data.set_price(4.0, METALS.ZINC, QUALITY.A)
+    market_data.set_price(9.0, METALS.COPPER, QUALITY.DEFAULT)
+
+    assert book.get_dependent_orders(METALS.ZINC, QUALITY.B) == {1}
+    assert changed == [{1}, {0, 1, 2}]
+    assert np.allclose(
+        book_totals(book), totals_from_scratch(static_data, market_data, ORDERS)
+    )
+
+
+def test_static_update_reprices_dependent_orders(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    changed = []
+    book.add_listener(changed.append)
+
+    # Moving the 100 breakpoint to 110 moves the 108 rod to the 75-110 band
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (110, 1.15), (125, 1.25)])
+    # Factor of the top band only
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (110, 1.15), (125, 1.3)])
+    static_data.set_copper_fraction(0.7)
+
+    assert changed == [{0}, {1}, {0, 1, 2}]
+    assert np.allclose(
+        book_totals(book), totals_from_scratch(static_data, market_data, ORDERS)
+    )
+
+
+def test_compact_orders_match_graph_orders(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    compact_book = OrderBook(static_data, compact_orders=True)
+    compact_book.add_orders(ORDERS, market_data)
+
+    assert book_totals(compact_book) == book_totals(book)
+    market_data.set_price(9.0, METALS.COPPER, QUALITY.DEFAULT)
+    assert book_totals(compact_book) == book_totals(book)
+    for k, order in compact_book._client_orders.items():
+        assert order._graph is None
+        assert order.get_gamma(METALS.COPPER, METALS.ZINC) == book._client_orders[
+            k
+        ].get_gamma(METALS.COPPER, METALS.ZINC)
+        assert order._graph is None
+        assert not hasattr(order, "__dict__")
+
+
+@pytest.mark.parametrize("compact_orders", [False, True])
+def test_market_sensitivities_from_book_graph(compact_orders, static_data, market_data):
+    orders = {**ORDERS, 3: ["User 4", 500, 130, "AA"], 4: ["User 5", 12.5, 80, "B"]}
+    book = OrderBook(static_data, compact_orders=compact_orders)
+    book.add_orders(orders, market_data)
+    batch_book = BatchOrderBook(static_data)
+    batch_book.add_orders(orders, market_data)
+
+    sensitivities = book.get_market_sensitivities()
+    expected = {}
+    for order in book._client_orders.values():
+        for metal, quality in [
+            (METALS.COPPER, QUALITY.DEFAULT),
+            (METALS.ZINC, order.get_zinc_quality()),
+        ]:
+            expected[metal, quality] = expected.get(
+                (metal, quality), 0.0
+            ) + order.get_sensitivity(metal)
+
+    assert sensitivities.keys() == expected.keys()
+    for key, value in expected.items():
+        assert np.isclose(sensitivities[key], value, rtol=1e-12)
+    batch_sensitivities = batch_book.get_market_sensitivities()
+    assert batch_sensitivities.keys() == expected.keys()
+    for key, value in expected.items():
+        assert np.isclose(batch_sensitivities[key], value, rtol=1e-12)
+
+
+def test_book_graph_total_matches_order_prices(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+    book_graph = BookGraph()
+    for order in book._client_orders.values():
+        book_graph.add_order(order.get_graph_inputs(), order.get_zinc_quality())
+
+    assert len(book_graph) == len(ORDERS)
+    assert book_graph.get_total_price() == book.get_order_prices()[2][-1]
+    gradient = book_graph.get_market_gradient()
+    assert np.isclose(gradient[METALS.ZINC, QUALITY.AA], 2340 * 0.34 * 1.15, rtol=1e-12)
+    assert np.isclose(
+        gradient[METALS.COPPER, QUALITY.DEFAULT],
+        0.66 * (2340 * 1.15 + 1820 * 1.25 + 27040 * 1.1),
+        rtol=1e-12,
+    )
+
+
+def test_empty_book_market_sensitivities(static_data):
+    assert OrderBook(static_data).get_market_sensitivities() == {}
+    assert BatchOrderBook(static_data).get_market_sensitivities() == {}
+    assert BookGraph().get_total_price() == 0.0
+
+
+def test_market_sensitivities_follow_book_changes(static_data, market_data):
+    book = OrderBook(static_data)
+    book.add_orders(ORDERS, market_data)
+
+    def expected_sensitivities():
+        fresh_book = OrderBook(static_data)
+        fresh_book.add_orders({k: ORDERS[k] for k in book._client_orders}, market_data)
+        return fresh_book.get_market_sensitivities()
+
+    sensitivities = book.get_market_sensitivities()
+    assert book.get_market_sensitivities() == sensitivities
+
+    market_data.set_price(3.9, METALS.ZINC, QUALITY.C)
+    assert book.get_market_sensitivities() == expected_sensitivities()
+    assert book.get_market_sensitivities() != sensitivities
+
+    book.remove_order(2)
+    assert book.get_market_sensitivities() == expected_sensitivities()
+    book.add_order(2, ORDERS[2])
+    assert book.get_market_sensitivities() == expected_sensitivities()
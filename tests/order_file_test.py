@@ -0,0 +1,120 @@
+# External dependencies
+import pytest
+import numpy as np
+import pandas as pd
+
+# Internal dependencies
+from aad_pricing.external_input.OrderFile import price_order_file, read_order_chunks
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+
+
+@pytest.fixture
+def static_data():
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    return static_data
+
+
+@pytest.fixture
+def market_data():
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), [7.5, 4.9, 3.5, 3.05]):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+    return market_data
+
+
+def random_order_frame(n_orders, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "client": ["Client " + str(k) for k in range(n_orders)],
+            "weight": rng.uniform(1.0, 30000.0, n_orders),
+            "rod_length": rng.uniform(1.0, 200.0, n_orders),
+            "zinc_quality": rng.choice(QUALITY.get_all_qualities(), n_orders),
+        }
+    )
+
+
+def write_order_frame(frame, path):
+    if path.suffix == ".parquet":
+        pytest.importorskip("pyarrow", reason="requires the parquet extra")
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def read_price_frame(path):
+    return pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+
+
+@pytest.mark.parametrize(
+    "input_name, output_name, chunk_size",
+    [
+        ("orders.csv", "prices.csv", 7),
+        ("orders.csv", "prices.parquet", 100),
+        ("orders.parquet", "prices.csv", 30),
+    ],
+)
+def test_priced_order_file_matches_order_book(
+    input_name, output_name, chunk_size, static_data, market_data, tmp_path
+):
+    frame = random_order_frame(50)
+    input_path, output_path = tmp_path / input_name, tmp_path / output_name
+    write_order_frame(frame, input_path)
+
+    summary = price_order_file(
+        input_path, output_path, static_data, market_data, chunk_size
+    )
+    prices = read_price_frame(output_path)
+
+    order_book = OrderBook(static_data)
+    order_book.add_orders(
+        {k: list(row) for k, row in enumerate(frame.itertuples(index=False))},
+        market_data,
+    )
+    _, names, expected_prices = order_book.get_order_prices()
+    assert summary["orders"] == 50
+    assert summary["chunks"] == -(-50 // chunk_size)
+    assert prices["order_id"].tolist() == list(range(50))
+    assert prices["client"].tolist() == names[:-1]
+    assert np.allclose(prices["price"], expected_prices[:-1], rtol=1e-12)
+    assert np.isclose(summary["total_price"], expected_prices[-1])
+    assert np.isclose(
+        summary["zinc_sensitivity"], order_book.get_total_sensitivity(METALS.ZINC)
+    )
+
+
+@pytest.mark.parametrize(
+    "column, value",
+    [("weight", "heavy"), ("rod_length", -5.0), ("zinc_quality", "D")],
+)
+def test_invalid_order_file_failure(column, value, tmp_path):
+    frame = random_order_frame(20)
+    frame[column] = frame[column].astype(object)
+    frame.loc[13, column] = value
+    path = tmp_path / "orders.csv"
+    frame.to_csv(path, index=False)
+
+    with pytest.raises(ValueError, match=rf"Invalid {column} .* rows \[13\]"):
+        list(read_order_chunks(path, chunk_size=5))
+
+
+def test_rod_length_below_labour_factors_failure(static_data, market_data, tmp_path):
+    static_data.set_labour_factors([(50.0, 1.1), (100, 1.15), (125, 1.25)])
+    frame = random_order_frame(20)
+    frame["rod_length"] = 60.0
+    frame.loc[13, "rod_length"] = 40.0
+    input_path = tmp_path / "orders.csv"
+    frame.to_csv(input_path, index=False)
+
+    with pytest.raises(ValueError, match=r"Invalid rod_length .* rows \[13\]"):
+        price_order_file(
+            input_path, tmp_path / "prices.csv", static_data, market_data, 5
+        )
+    # The same file is valid without a labour factor table to check against
+    assert len(list(read_order_chunks(input_path, chunk_size=5))) == 4
@@ -0,0 +1,84 @@
+# External dependencies
+import pytest
+
+# Internal dependencies
+from aad_pricing.pricing.OrderBook import OrderBook
+from aad_pricing.pricing.PricingCache import PricingCache, PricingResult
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+
+ORDERS = {
+    0: ["User 1", 2340, 108, "AA"],
+    1: ["User 2", 1820, 144, "B"],
+    2: ["User 3", 27040, 93, "C"],
+    3: ["User 4", 2340, 108, "AA"],
+    4: ["User 1", 1820, 144, "B"],
+}
+
+
+@pytest.fixture
+def static_data():
+    static_data = StaticData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    return static_data
+
+
+@pytest.fixture
+def market_data():
+    market_data = MarketData()
+    market_data.set_price(8.22, METALS.COPPER, QUALITY.DEFAULT)
+    for quality, price in zip(QUALITY.get_all_qualities(), [7.5, 4.9, 3.5, 3.05]):
+        market_data.set_price(price, METALS.ZINC, QUALITY(quality))
+    return market_data
+
+
+def test_cache_counters_and_lru_eviction():
+    cache = PricingCache(capacity=2)
+    results = {key: PricingResult(float(key), 0.0, 0.0) for key in range(3)}
+    cache.put(0, results[0])
+    cache.put(1, results[1])
+    assert cache.get(0) == results[0]
+    # Key 1 is the least recently used
+    cache.put(2, results[2])
+
+    assert cache.get(1) is None
+    assert cache.get(2) == results[2]
+    assert cache.get_statistics() == {
+        "size": 2,
+        "capacity": 2,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "hit_rate": 2 / 3,
+    }
+
+
+def test_cached_order_book_matches_order_book(static_data, market_data):
+    cache = PricingCache()
+    order_book, cached_book = OrderBook(static_data), OrderBook(static_data, cache)
+    order_book.add_orders(ORDERS, market_data)
+    cached_book.add_orders(ORDERS, market_data)
+
+    assert cached_book.get_order_prices() == order_book.get_order_prices()
+    for metal in (METALS.COPPER, METALS.ZINC):
+        assert cached_book.get_total_sensitivity(
+            metal
+        ) == order_book.get_total_sensitivity(metal)
+    # Orders 3 and 4 repeat the parameters of orders 0 and 1
+    assert cache.get_statistics()["hits"] == 2
+    assert cache.get_statistics()["misses"] == 3
+
+    market_data.set_price(8.5, METALS.COPPER, QUALITY.DEFAULT)
+    assert cached_book.get_order_prices() == order_book.get_order_prices()
+    assert len(cache) == 6
+
+
+def test_cache_shared_between_books(static_data, market_data):
+    cache = PricingCache()
+    OrderBook(static_data, cache).add_orders(ORDERS, market_data)
+    OrderBook(static_data, cache).add_orders(ORDERS, market_data)
+
+    assert cache.get_statistics()["misses"] == 3
+    assert cache.get_statistics()["hits"] == 7
@@ -0,0 +1,51 @@
+# Internal dependencies
+from aad_pricing.pricing.ResultStore import BookResult, ResultStore, input_hash
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Constants import METALS, QUALITY
+from aad_pricing.external_input.MarketData import MarketData
+
+ORDERS = {
+    0: ["User 1", 2340, 108, "AA"],
+    1: ["User 2", 1820, 144, "B"],
+}
+
+
+def build_data(copper_price):
+    static_data, market_data = StaticData(), MarketData()
+    static_data.set_copper_fraction(0.66)
+    static_data.set_labour_factors([(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)])
+    market_data.set_price(copper_price, METALS.COPPER, QUALITY.DEFAULT)
+    return static_data, market_data
+
+
+def test_input_hash_depends_on_inputs_only():
+    key = input_hash(ORDERS, *build_data(8.22))
+
+    assert key == input_hash(dict(reversed(ORDERS.items())), *build_data(8.22))
+    assert key != input_hash(ORDERS, *build_data(8.5))
+    assert key != input_hash({0: ORDERS[0]}, *build_data(8.22))
+
+
+def test_results_are_stored_per_session():
+    store = ResultStore(max_sessions=2, results_per_session=2)
+    result = BookResult(([1, ""], ["User 1", "TOTAL"], [10.0, 10.0]), 1.0, 2.0)
+    store.put("session 1", "key 1", result)
+
+    assert store.get("session 1", "key 1") == result
+    assert store.get("session 2", "key 1") is None
+    assert result.get_sensitivity(METALS.ZINC) == 2.0
+
+
+def test_least_recently_used_results_are_dropped():
+    store = ResultStore(max_sessions=2, results_per_session=2)
+    result = BookResult((), 0.0, 0.0)
+    for key in ["key 1", "key 2", "key 3"]:
+        store.put("session 1", key, result)
+    store.put("session 2", "key 1", result)
+    store.get("session 1", "key 2")
+    store.put("session 3", "key 1", result)
+
+    assert store.get("session 1", "key 1") is None
+    assert store.get("session 1", "key 3") == result
+    assert store.get("session 2", "key 1") is None
+    assert len(store) == 2
@@ -0,0 +1,103 @@
+import dataclasses
+import pickle
+import pytest
+
+from aad_pricing.static.StaticData import StaticData
+from aad_pricing.static.Snapshot import Snapshot
+from aad_pricing.static.Constants import METALS
+import numpy as np
+
+LABOUR_FACTORS = [(0, 1.05), (75.0, 1.1), (100, 1.15), (125, 1.25)]
+
+
+@pytest.fixture
+def static_data():
+    static_data = StaticData()
+    static_data.set_labour_factors(LABOUR_FACTORS)
+    return static_data
+
+
+@pytest.mark.parametrize(
+    "rod_length,labour_factor",
+    [
+        (0.0, 1.05),
+        (50.0, 1.05),
+        (75.0, 1.05),
+        (75.5, 1.1),
+        (100.0, 1.1),
+        (124.0, 1.15),
+        (125.0, 1.15),
+        (500.0, 1.25),
+    ],
+)
+def test_get_labour_factor(static_data, rod_length, labour_factor):
+    assert np.isclose(static_data.get_labour_factor(rod_length), labour_factor)
+
+
+def test_vectorised_labour_factors_match_scalar(static_data):
+    rod_lengths = np.random.default_rng(0).uniform(0.0, 200.0, 1000)
+    rod_lengths[:4] = [0.0, 75.0, 100.0, 125.0]
+
+    labour_factors = static_data.get_labour_factors(rod_lengths)
+
+    assert np.array_equal(
+        labour_factors, [static_data.get_labour_factor(x) for x in rod_lengths]
+    )
+
+
+@pytest.mark.parametrize("rod_length", [-1.0, np.nan])
+def test_labour_factor_out_of_range_failure(static_data, rod_length):
+    with pytest.raises(ValueError, match=r"at least the first labour factor"):
+        static_data.get_labour_factor(rod_length)
+    with pytest.raises(ValueError, match=r"at least the first labour factor"):
+        static_data.get_labour_factors(np.array([10.0, rod_length]))
+
+
+def test_static_data_is_instance_scoped():
+    static_data_a, static_data_b = StaticData(), StaticData()
+    static_data_a.set_copper_fraction(0.6)
+    static_data_b.set_copper_fraction(0.7)
+    static_data_a.set_labour_factors(LABOUR_FACTORS)
+
+    assert np.isclose(static_data_a.get_alloy_mass_fraction(METALS.COPPER), 0.6)
+    assert np.isclose(static_data_b.get_alloy_mass_fraction(METALS.COPPER), 0.7)
+    assert static_data_b.get_labour_factor_table() == []
+
+
+def test_static_data_snapshot(static_data):
+    static_data.set_copper_fraction(0.66)
+    snapshot = static_data.snapshot()
+    static_data.set_copper_fraction(0.5)
+
+    assert snapshot.get_alloy_mass_fraction(METALS.COPPER) == 0.66
+    assert snapshot.get_alloy_mass_fraction(METALS.ZINC) == 1.0 - 0.66
+    for rod_length in [0.0, 75.0, 80.0, 300.0]:
+        assert snapshot.get_labour_factor(rod_length) == static_data.get_labour_factor(
+            rod_length
+        )
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.copper_fraction = 0.5
+
+
+def test_static_data_snapshot_hash(static_data):
+    static_data.set_copper_fraction(0.66)
+    snapshot = static_data.snapshot()
+    other = StaticData()
+    other.set_labour_factors(list(LABOUR_FACTORS))
+    other.set_copper_fraction(0.66)
+
+    assert snapshot == other.snapshot()
+    assert snapshot.content_hash == other.snapshot().content_hash
+    assert pickle.loads(pickle.dumps(snapshot)).content_hash == snapshot.content_hash
+
+    other.set_copper_fraction(0.67)
+    assert snapshot.content_hash != other.snapshot().content_hash
+
+
+def test_incomplete_snapshot_cannot_be_created():
+    @dataclasses.dataclass(frozen=True)
+    class IncompleteSnapshot(Snapshot):
+        value: float
+
+    with pytest.raises(TypeError):
+        IncompleteSnapshot(1.0)
@@ -0,0 +1,56 @@
+# External dependencies
+import pytest
+import numpy as np
+
+# Internal dependencies
+from aad_pricing.pricing.DirectedAcyclicGraph import DirectedAcyclicGraph
+from aad_pricing.pricing.Tape import Tape
+from aad_pricing.static.Constants import METALS
+
+
+@pytest.mark.parametrize(
+    "weight,copper_fraction,copper_price, zinc_price, labour_factor",
+    [
+        (1.0, 1.0, 20.0, 5.0, 1.0),
+        (2.0, 0.8, 10.54, 5.0, 1.2),
+        (100.0, 0.3, 12.025, 8.32, 1.1),
+        (950.0, 0.66, 20.4, 15.0, 1.9),
+    ],
+)
+def test_tape_backend_matches_node_graph(
+    weight, copper_fraction, copper_price, zinc_price, labour_factor
+):
+    inputs = (weight, copper_fraction, copper_price, zinc_price, labour_factor)
+    node_graph = DirectedAcyclicGraph(*inputs)
+    tape_graph = DirectedAcyclicGraph(*inputs, use_tape=True)
+
+    assert tape_graph.get_price() == node_graph.get_price()
+    for metal in (METALS.COPPER, METALS.ZINC):
+        assert np.isclose(
+            tape_graph.get_price_sensitivity(metal),
+            node_graph.get_price_sensitivity(metal),
+        )
+
+
+def test_tape_backward_on_deep_chain():
+    # Deep enough to exceed the recursion limit of a recursive sweep
+    tape = Tape()
+    x = tape.variable(1.0001)
+    one = tape.variable(1.0)
+    y = x
+    for _ in range(10_000):
+        y = y * x + one - one
+
+    y.set_gradient(1.0)
+    # y = x ** 10001
+    assert np.isclose(y.get_value(), 1.0001**10_001)
+    assert np.isclose(x.get_gradient(), 10_001 * 1.0001**10_000)
+
+
+def test_tape_requires_seed():
+    tape = Tape()
+    x = tape.variable(2.0)
+    x * x
+
+    with pytest.raises(RuntimeError, match="Seed an output node"):
+        x.get_gradient()